@@ -1,18 +1,46 @@
 import simpy
 import random
 import math
+import os
+import queue
+import sys
 import time
 from dataclasses import dataclass
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 from datetime import datetime
-import csv
 from enum import Enum
+from collections import defaultdict
+from itertools import chain, repeat
+from operator import itemgetter
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow é opcional: sem ele a exportação fica sempre em CSV
+    pa = pq = None
 
 # Configurações globais da simulação
 SIM_TIME = 3600  # Tempo total de simulação em segundos
 DISTANCES = [100, 200, 300, 400]  # Distâncias dos dispositivos ao gateway em metros
 DEVICE_NAMES = ["ESP32-1", "ESP32-2", "ESP32-3", "ESP32-4"]
 INITIAL_TEMPS = [27.5, 28.2, 27.8, 28.5]  # Temperaturas iniciais mais adequadas para Amazônia
+RAINY_MONTHS = frozenset({12, 1, 2, 3, 4, 5})  # Dez-Mai: estação chuvosa
+BANNER = "=" * 70  # Separador das seções do relatório
+EXPORT_BUFFER_SIZE = 1 << 20  # Buffer de escrita dos CSV exportados (1 MB)
+EXPORT_CHUNK_SIZE = 100_000  # Linhas de pacotes formatadas e gravadas por vez
+EXPORT_STREAM_BATCH = 1000  # Linhas acumuladas por seção antes de cada escrita na exportação contínua
+EXPORT_QUEUE_SIZE = 10_000  # Registros pendentes na fila da exportação contínua
+PACKET_FIELDS = ['timestamp', 'device_id', 'device_name', 'temperature',
+                 'rssi', 'snr', 'latency', 'sf', 'bw', 'cr']  # Campos de todo pacote recebido
+CLIMATE_FIELDS = ['humidity', 'is_raining', 'rain_intensity']  # Campos climáticos opcionais
+EXPORT_SECTIONS = {  # Seção exportável -> (prefixo do arquivo, descrição)
+    'stats': ('network_stats', 'Estatísticas gerais da rede'),
+    'env': ('environmental_data', 'Dados de temperatura e clima'),
+    'metrics': ('metrics_data', 'Métricas de comunicação'),
+    'packets': ('received_packets', 'Detalhes dos pacotes recebidos'),
+}
 
 # Configurações LoRaWAN padrão
 DEFAULT_SF = 7  # Spreading Factor (7-12)
@@ -310,6 +338,9 @@ class LoRaDevice:
         self.last_snr = 0
         self.latencies = []
         
+        # Fila da exportação contínua (ver LoRaNetworkSimulation.start_export_stream)
+        self.export_queue = None
+        
         # Histórico de dados
         self.history = {
             'timestamp': [],
@@ -521,6 +552,11 @@ class LoRaDevice:
             self.history['snr'].append(snr)
             self.history['latency'].append(latency * 1000)  # Converte para ms
             self.history['energy'].append(self.energy_used)
+            if self.export_queue is not None:
+                self.export_queue.put(('env', (timestamp, self.name, temp_value, climate_data['humidity'],
+                                               self.history['rain'][-1])))
+                self.export_queue.put(('metrics', (timestamp, self.name, rssi, snr, latency * 1000,
+                                                   self.energy_used)))
             
             # Se o sensor falhou, não envia o pacote
             if math.isnan(temperature):
@@ -586,6 +622,7 @@ class LoRaGateway:
         self.climate = climate
         self.devices = []
         self.received_data = []
+        self.export_queue = None  # Fila da exportação contínua, quando ativa
         self.uptime = 100  # Percentual de tempo ativo
         
         # Iniciar processo de simulação de disponibilidade
@@ -660,6 +697,8 @@ class LoRaGateway:
             packet_data['rain_intensity'] = climate_data['rain_intensity']
         
         self.received_data.append(packet_data)
+        if self.export_queue is not None:
+            self.export_queue.put(('packets', packet_data))
         
         # Formata mensagem de recebimento com dados climáticos quando disponíveis
         climate_info = ""
@@ -718,6 +757,14 @@ class LoRaNetworkSimulation:
         # Para visualização em tempo real
         self.running = False
         self.data_lock = threading.Lock()
+        
+        # Exportação contínua (ativada por start_export_stream)
+        self.export_queue = None
+        self.export_thread = None
+        self.export_timestamp = None
+        self.export_paths = None
+        self.export_rows = None
+        self.export_error = None  # Erro da thread de gravação, relançado por finish_export_stream
     
     def run_simulation(self, duration=SIM_TIME):
         """Executa a simulação por um período determinado"""
@@ -777,149 +824,363 @@ class LoRaNetworkSimulation:
             device.config.tp = tp
         print(f"Configuração de {device.name} alterada: SF={device.config.sf}, BW={device.config.bw}, CR=4/{device.config.cr}, TP={device.config.tp}dBm")
     
-    def export_to_csv(self):
-        """Exporta os resultados da simulação para arquivos CSV"""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    def write_network_stats(self, path, stats):
+        """Grava as estatísticas de rede de cada dispositivo em CSV"""
+        with open(path, 'w', newline='', buffering=EXPORT_BUFFER_SIZE) as csvfile:
+            csvfile.write('device,packets_sent,packets_received,pdr,plr,'
+                          'avg_latency,jitter,rssi,snr,energy,airtime,battery\n')
+            row = '{},{},{},{},{},{},{},{},{},{},{},{}\n'.format
+            fields = itemgetter('packets_sent', 'packets_received', 'pdr', 'plr', 'avg_latency',
+                                'jitter', 'rssi', 'snr', 'energy', 'airtime', 'battery')
+            csvfile.write(''.join(
+                row(device_name, *fields(device_stats)) for device_name, device_stats in stats.items()))
+    
+    def write_environmental_data(self, path, temp_data):
+        """Grava as séries de temperatura e clima em CSV (leituras com falha ou ausentes ficam vazias)"""
+        # As séries são convertidas para texto coluna a coluna e gravadas em um bloco por dispositivo
+        with open(path, 'w', newline='', buffering=EXPORT_BUFFER_SIZE) as csvfile:
+            write = csvfile.write
+            write('timestamp,device,temperature,humidity,rain_intensity\n')
+            for device_name, data in temp_data.items():
+                temperatures = ['' if t is None else str(t) for t in data['temperature']]
+                humidities = ['' if h is None else str(h) for h in data['humidity']]  # None sem clima
+                write(format_csv_rows(data['timestamp'], repeat(device_name), temperatures,
+                                      humidities, map(str, data['rain'])))
+    
+    def write_metrics_data(self, path, metric_data):
+        """Grava as séries de métricas de comunicação em CSV"""
+        # As linhas de todos os dispositivos são geradas sob demanda e gravadas por um único
+        # writelines, sem montar o bloco de texto inteiro de cada dispositivo na memória
+        with open(path, 'w', newline='', buffering=EXPORT_BUFFER_SIZE) as csvfile:
+            csvfile.write('timestamp,device,rssi,snr,latency,energy\n')
+            csvfile.writelines(chain.from_iterable(
+                iter_csv_rows(data['timestamp'], repeat(device_name),
+                              map(str, data['rssi']), map(str, data['snr']),
+                              map(str, data['latency']), map(str, data['energy']))
+                for device_name, data in metric_data.items()))
+    
+    def write_received_packets(self, path, packets, chunk_size=EXPORT_CHUNK_SIZE):
+        """Grava os pacotes recebidos pelo gateway em CSV, formatando `chunk_size` linhas por vez"""
+        # Maior arquivo da exportação: cada bloco é codificado uma vez e gravado direto no
+        # descritor, sem passar pela camada de texto/buffer do open()
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+        try:
+            fieldnames = packet_fieldnames(packets)
+            write_fd(fd, (','.join(fieldnames) + '\n').encode())
+            row = (','.join('{%s}' % name for name in fieldnames) + '\n').format_map
+            # Pacotes sem algum dos campos ou com campos None (ex.: sem dados climáticos)
+            # saem com o campo vazio, como no DictWriter
+            n_fields = len(fieldnames)
+            for start in range(0, len(packets), chunk_size):
+                write_fd(fd, ''.join(
+                    row(packet if len(packet) == n_fields and None not in packet.values()
+                        else blank_fields(packet))
+                    for packet in packets[start:start + chunk_size]).encode())
+        finally:
+            os.close(fd)
+    
+    def write_parquet_tables(self, timestamp, datasets):
+        """Grava cada seção de `datasets` em um arquivo Parquet (colunar, compressão snappy)"""
+        stats_columns = ['packets_sent', 'packets_received', 'pdr', 'plr', 'avg_latency',
+                         'jitter', 'rssi', 'snr', 'energy', 'airtime', 'battery']
+        builders = {
+            'stats': lambda stats: pa.table({
+                'device': list(stats),
+                **{column: [device_stats[column] for device_stats in stats.values()]
+                   for column in stats_columns},
+            }),
+            'env': lambda temp_data: series_table(temp_data, {
+                'temperature': 'temperature', 'humidity': 'humidity', 'rain_intensity': 'rain'}),
+            'metrics': lambda metric_data: series_table(metric_data, {
+                'rssi': 'rssi', 'snr': 'snr', 'latency': 'latency', 'energy': 'energy'}),
+            'packets': lambda packets: pa.table({
+                name: [packet.get(name) for packet in packets] for name in packet_fieldnames(packets)}),
+        }
+        for section, data in datasets.items():
+            pq.write_table(builders[section](data), f'{EXPORT_SECTIONS[section][0]}_{timestamp}.parquet',
+                           compression='snappy')
+    
+    def export_to_csv(self, timestamp=None, fmt='csv', sections=tuple(EXPORT_SECTIONS)):
+        """Exporta os resultados da simulação para arquivos CSV (ou Parquet, com fmt='parquet')
         
-        # 1. Exportar estatísticas de rede
-        stats = self.get_network_stats()
-        with open(f'network_stats_{timestamp}.csv', 'w', newline='') as csvfile:
-            fieldnames = ['device', 'packets_sent', 'packets_received', 'pdr', 'plr', 
-                         'avg_latency', 'jitter', 'rssi', 'snr', 'energy', 'airtime', 'battery']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            
-            writer.writeheader()
-            for device_name, device_stats in stats.items():
-                row = {
-                    'device': device_name,
-                    'packets_sent': device_stats['packets_sent'],
-                    'packets_received': device_stats['packets_received'],
-                    'pdr': device_stats['pdr'],
-                    'plr': device_stats['plr'],
-                    'avg_latency': device_stats['avg_latency'],
-                    'jitter': device_stats['jitter'],
-                    'rssi': device_stats['rssi'],
-                    'snr': device_stats['snr'],
-                    'energy': device_stats['energy'],
-                    'airtime': device_stats['airtime'],
-                    'battery': device_stats['battery']
-                }
-                writer.writerow(row)
+        Args:
+            timestamp: Sufixo dos nomes de arquivo (padrão: data e hora atuais)
+            fmt: 'csv' ou 'parquet' (Parquet exige pyarrow; sem ele, grava CSV)
+            sections: Seções a exportar, entre 'stats', 'env', 'metrics' e 'packets'
+        """
+        if fmt not in ('csv', 'parquet'):
+            raise ValueError(f"Formato de exportação desconhecido: {fmt}")
+        unknown = set(sections).difference(EXPORT_SECTIONS)
+        if unknown:
+            raise ValueError(f"Seções de exportação desconhecidas: {', '.join(sorted(unknown))}")
+        if fmt == 'parquet' and pq is None:
+            fmt = 'csv'  # Sem pyarrow instalado, mantém a exportação em CSV
+        timestamp = timestamp or datetime.now().strftime('%Y%m%d_%H%M%S')
+        
+        # Os dados das seções pedidas são coletados aqui, na thread que chamou; seções
+        # sem nenhum registro não geram arquivo
+        datasets = {}
+        if 'stats' in sections:
+            datasets['stats'] = self.get_network_stats()
+        if 'env' in sections:
+            datasets['env'] = self.get_all_temperature_data()
+        if 'metrics' in sections:
+            datasets['metrics'] = self.get_all_metric_data()
+        if 'packets' in sections:
+            with self.data_lock:
+                datasets['packets'] = list(self.gateway.received_data)
+        for section in ('env', 'metrics'):
+            if section in datasets and not any(data['timestamp'] for data in datasets[section].values()):
+                del datasets[section]
+        datasets = {section: data for section, data in datasets.items() if data}
+        
+        if fmt == 'parquet':
+            self.write_parquet_tables(timestamp, datasets)
+        else:
+            # Cada arquivo é gravado em paralelo; cada seção usa um modelo de linha fixo e é
+            # gravada em blocos (os campos são números ou nomes simples, sem vírgulas ou aspas a escapar)
+            writers = {
+                'stats': self.write_network_stats,
+                'env': self.write_environmental_data,
+                'metrics': self.write_metrics_data,
+                'packets': self.write_received_packets,
+            }
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                futures = [
+                    executor.submit(writers[section], f'{EXPORT_SECTIONS[section][0]}_{timestamp}.csv', data)
+                    for section, data in datasets.items()
+                ]
+                for future in futures:
+                    future.result()  # Propaga erros de escrita
+        
+        if not datasets:
+            print("\nNenhum dado a exportar")
+            return
+        print(f"\nResultados exportados para arquivos {fmt.upper()} com prefixo timestamp {timestamp}")
+        for section in datasets:
+            basename, description = EXPORT_SECTIONS[section]
+            print(f"- {basename}_{timestamp}.{fmt}: {description}")
+
+    def start_export_stream(self, timestamp=None):
+        """Passa a gravar dados ambientais, métricas e pacotes em CSV durante a simulação
         
-        # 2. Exportar dados de temperatura e clima
-        temp_data = self.get_all_temperature_data()
-        with open(f'environmental_data_{timestamp}.csv', 'w', newline='') as csvfile:
-            fieldnames = ['timestamp', 'device', 'temperature', 'humidity', 'rain_intensity']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            
-            writer.writeheader()
-            for device_name, data in temp_data.items():
-                for i in range(len(data['timestamp'])):
-                    writer.writerow({
-                        'timestamp': data['timestamp'][i],
-                        'device': device_name,
-                        'temperature': data['temperature'][i],
-                        'humidity': data['humidity'][i],
-                        'rain_intensity': data['rain'][i]
-                    })
-        
-        # 3. Exportar dados de métricas
-        metric_data = self.get_all_metric_data()
-        with open(f'metrics_data_{timestamp}.csv', 'w', newline='') as csvfile:
-            fieldnames = ['timestamp', 'device', 'rssi', 'snr', 'latency', 'energy']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            
-            writer.writeheader()
-            for device_name, data in metric_data.items():
-                for i in range(len(data['timestamp'])):
-                    writer.writerow({
-                        'timestamp': data['timestamp'][i],
-                        'device': device_name,
-                        'rssi': data['rssi'][i],
-                        'snr': data['snr'][i],
-                        'latency': data['latency'][i],
-                        'energy': data['energy'][i]
-                    })
-        
-        # 4. Exportar dados de pacotes recebidos
-        with open(f'received_packets_{timestamp}.csv', 'w', newline='') as csvfile:
-            # Determina os fieldnames com base no primeiro pacote recebido (que pode ter dados climáticos)
-            fieldnames = ['timestamp', 'device_id', 'device_name', 'temperature', 
-                         'rssi', 'snr', 'latency', 'sf', 'bw', 'cr']
-            
-            if self.gateway.received_data and 'humidity' in self.gateway.received_data[0]:
-                fieldnames.extend(['humidity', 'is_raining', 'rain_intensity'])
-            
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            for packet in self.gateway.received_data:
-                writer.writerow(packet)
-        
-        print(f"\nResultados exportados para arquivos CSV com prefixo timestamp {timestamp}")
-        print(f"- network_stats_{timestamp}.csv: Estatísticas gerais da rede")
-        print(f"- environmental_data_{timestamp}.csv: Dados de temperatura e clima")
-        print(f"- metrics_data_{timestamp}.csv: Métricas de comunicação")
-        print(f"- received_packets_{timestamp}.csv: Detalhes dos pacotes recebidos")
+        Os dispositivos e o gateway apenas enfileiram cada registro; uma thread de fundo
+        formata e grava os arquivos, sobrepondo a escrita em disco à simulação. Chame
+        finish_export_stream ao final para fechar os arquivos e gravar as estatísticas.
+        """
+        if self.export_thread is not None:
+            raise RuntimeError("A exportação contínua já está ativa; chame finish_export_stream antes")
+        self.export_timestamp = timestamp or datetime.now().strftime('%Y%m%d_%H%M%S')
+        # Caminhos absolutos: a thread de fundo e o final da exportação não dependem do diretório atual
+        self.export_paths = {section: os.path.abspath(f'{basename}_{self.export_timestamp}.csv')
+                             for section, (basename, _) in EXPORT_SECTIONS.items()}
+        # Os pacotes sempre trazem os dados climáticos (o dispositivo envia climate_data)
+        headers = {
+            'env': 'timestamp,device,temperature,humidity,rain_intensity\n',
+            'metrics': 'timestamp,device,rssi,snr,latency,energy\n',
+            'packets': ','.join(PACKET_FIELDS + CLIMATE_FIELDS) + '\n',
+        }
+        files = {}
+        try:
+            for section, header in headers.items():
+                files[section] = open(self.export_paths[section], 'w', newline='', buffering=EXPORT_BUFFER_SIZE)
+                files[section].write(header)
+        except OSError:
+            for csvfile in files.values():
+                csvfile.close()
+            raise
+        
+        self.export_rows = dict.fromkeys(headers, 0)
+        self.export_error = None
+        self.export_queue = queue.Queue(maxsize=EXPORT_QUEUE_SIZE)
+        self.export_thread = threading.Thread(target=self.export_worker, args=(self.export_queue, files), daemon=True)
+        self.export_thread.start()
+        self.gateway.export_queue = self.export_queue
+        for device in self.devices:
+            device.export_queue = self.export_queue
+    
+    def export_worker(self, export_queue, files):
+        """Consome a fila de exportação e grava as linhas de cada seção em lotes"""
+        fieldnames = PACKET_FIELDS + CLIMATE_FIELDS
+        packet_row = (','.join('{%s}' % name for name in fieldnames) + '\n').format_map
+        n_fields = len(fieldnames)
+        env_row = '{},{},{},{},{}\n'.format
+        metrics_row = '{},{},{},{},{},{}\n'.format
+        formatters = {
+            # Leituras com falha ou ausentes (None) ficam vazias, como em write_environmental_data
+            'env': lambda record: env_row(record[0], record[1], '' if record[2] is None else record[2],
+                                          '' if record[3] is None else record[3], record[4]),
+            'metrics': lambda record: metrics_row(*record),
+            'packets': lambda packet: packet_row(
+                packet if len(packet) == n_fields and None not in packet.values() else blank_fields(packet)),
+        }
+        rows = self.export_rows
+        pending = {section: [] for section in files}
+        stopped = False
+        try:
+            with ExitStack() as stack:
+                for csvfile in files.values():
+                    stack.enter_context(csvfile)
+                while True:
+                    item = export_queue.get()
+                    if item is None:
+                        stopped = True
+                        break
+                    section, record = item
+                    rows[section] += 1
+                    lines = pending[section]
+                    lines.append(formatters[section](record))
+                    if len(lines) >= EXPORT_STREAM_BATCH:
+                        files[section].write(''.join(lines))
+                        lines.clear()
+                for section, lines in pending.items():
+                    files[section].write(''.join(lines))
+        except Exception as error:
+            # Guarda o erro para finish_export_stream e para de receber registros; a fila
+            # continua sendo esvaziada até o fim para nunca bloquear a simulação
+            self.export_error = error
+            self.detach_export_queue()
+            while not stopped:
+                stopped = export_queue.get() is None
+    
+    def detach_export_queue(self):
+        """Faz os dispositivos e o gateway pararem de enfileirar registros de exportação"""
+        self.gateway.export_queue = None
+        for device in self.devices:
+            device.export_queue = None
+    
+    def finish_export_stream(self):
+        """Encerra a exportação contínua, grava as estatísticas da rede e lista os arquivos
+        
+        Um erro ocorrido na thread de gravação é relançado aqui, sem listar os arquivos.
+        """
+        if self.export_thread is None:
+            raise RuntimeError("Nenhuma exportação contínua ativa; chame start_export_stream antes")
+        self.detach_export_queue()
+        self.export_queue.put(None)
+        self.export_thread.join()
+        self.export_queue = self.export_thread = None
+        if self.export_error is not None:
+            error, self.export_error = self.export_error, None
+            raise error
+        
+        self.write_network_stats(self.export_paths['stats'], self.get_network_stats())
+        
+        # Arquivos que não receberam nenhum registro são removidos, como em export_to_csv
+        written = ['stats']
+        for section, rows in self.export_rows.items():
+            if rows:
+                written.append(section)
+            else:
+                os.remove(self.export_paths[section])
+        
+        print(f"\nResultados exportados para arquivos CSV com prefixo timestamp {self.export_timestamp}")
+        for section in written:
+            print(f"- {os.path.basename(self.export_paths[section])}: {EXPORT_SECTIONS[section][1]}")
+
+def format_csv_rows(*columns):
+    """Monta linhas CSV a partir de colunas já convertidas para texto"""
+    return ''.join([','.join(row) + '\n' for row in zip(*columns)])
+
+def iter_csv_rows(*columns):
+    """Gera, uma a uma, as linhas CSV de colunas já convertidas para texto"""
+    return (','.join(row) + '\n' for row in zip(*columns))
+
+def blank_fields(packet):
+    """Mapeamento para format_map em que campos ausentes ou None ficam vazios, como no DictWriter"""
+    return defaultdict(str, {name: value for name, value in packet.items() if value is not None})
+
+def write_fd(fd, data):
+    """Grava todos os bytes em um descritor de arquivo (os.write pode gravar só parte)"""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+def packet_fieldnames(packets):
+    """Retorna os campos dos pacotes recebidos (união das chaves de todos os pacotes, em ordem fixa)"""
+    keys = set().union(*packets)
+    # Dados climáticos só entram se algum pacote os tiver; outros campos vêm por último, em ordem alfabética
+    fieldnames = PACKET_FIELDS + [name for name in CLIMATE_FIELDS if name in keys]
+    return fieldnames + sorted(keys.difference(fieldnames))
+
+def series_table(series, columns):
+    """Concatena as séries de cada dispositivo em uma tabela Arrow (`columns` mapeia coluna -> chave)"""
+    return pa.concat_tables([
+        pa.table({
+            'timestamp': data['timestamp'],
+            'device': [device_name] * len(data['timestamp']),
+            **{column: data[key] for column, key in columns.items()},
+        })
+        for device_name, data in series.items()
+    ], promote_options='default')
 
 def main():
     """Função principal para executar a simulação"""
     # Determina a estação baseada na data atual
     now = datetime.now()
-    month = now.month
-    is_rainy_season = month in [12, 1, 2, 3, 4, 5]  # Dez-Mai: estação chuvosa
-    season = SeasonType.RAINY if is_rainy_season else SeasonType.DRY
+    today = now.strftime('%d/%m/%Y')
+    season = SeasonType.RAINY if now.month in RAINY_MONTHS else SeasonType.DRY
     
-    print("=" * 70)
+    print(BANNER)
     print(f"🌴 SIMULAÇÃO DE REDE LORAWAN NO AMBIENTE AMAZÔNICO")
-    print("=" * 70)
-    print(f"📅 Data atual: {now.strftime('%d/%m/%Y')}")
+    print(BANNER)
+    print(f"📅 Data atual: {today}")
     print(f"🌧️ Estação: {season.value}")
     print(f"⏱️ Tempo de simulação: {SIM_TIME} segundos")
     print(f"📡 Dispositivos: {', '.join(DEVICE_NAMES)}")
     print(f"📏 Distâncias: {DISTANCES} metros")
     print(f"⚙️ Configuração padrão: SF={DEFAULT_SF}, BW={DEFAULT_BW}kHz, CR=4/{DEFAULT_CR}, TP={DEFAULT_TP}dBm")
-    print("=" * 70 + "\n")
+    print(BANNER + "\n")
     
     # Cria a simulação com clima amazônico
     simulation = LoRaNetworkSimulation(season=season, vegetation_density=0.8)
     
-    # Executa a simulação completa
+    # Executa a simulação completa, gravando os CSV enquanto os dados são produzidos
+    simulation.start_export_stream()
     simulation.run_simulation(SIM_TIME)
     
     # Exibe estatísticas finais
     stats = simulation.get_network_stats()
-    print("\n" + "=" * 70)
+    print("\n" + BANNER)
     print("📊 ESTATÍSTICAS FINAIS DA REDE LORAWAN")
-    print("=" * 70)
+    print(BANNER)
+    report = []
     for name, device_stats in stats.items():
-        print(f"\n--- {name} ---")
-        print(f"Pacotes enviados: {device_stats['packets_sent']}")
-        print(f"Pacotes recebidos: {device_stats['packets_received']}")
-        print(f"Taxa de entrega (PDR): {device_stats['pdr']:.1f}%")
-        print(f"Taxa de perda (PLR): {device_stats['plr']:.1f}%")
-        print(f"Latência média: {device_stats['avg_latency']:.2f}ms")
-        print(f"Jitter: {device_stats['jitter']:.2f}ms")
-        print(f"RSSI: {device_stats['rssi']}dBm")
-        print(f"SNR: {device_stats['snr']}dB")
-        print(f"Consumo de energia: {device_stats['energy']:.2f}mWh")
-        print(f"Tempo no ar: {device_stats['airtime']:.2f}ms")
-        print(f"Nível de bateria: {device_stats['battery']:.1f}%")
+        report.append(
+            f"\n--- {name} ---\n"
+            f"Pacotes enviados: {device_stats['packets_sent']}\n"
+            f"Pacotes recebidos: {device_stats['packets_received']}\n"
+            f"Taxa de entrega (PDR): {device_stats['pdr']:.1f}%\n"
+            f"Taxa de perda (PLR): {device_stats['plr']:.1f}%\n"
+            f"Latência média: {device_stats['avg_latency']:.2f}ms\n"
+            f"Jitter: {device_stats['jitter']:.2f}ms\n"
+            f"RSSI: {device_stats['rssi']}dBm\n"
+            f"SNR: {device_stats['snr']}dB\n"
+            f"Consumo de energia: {device_stats['energy']:.2f}mWh\n"
+            f"Tempo no ar: {device_stats['airtime']:.2f}ms\n"
+            f"Nível de bateria: {device_stats['battery']:.1f}%\n"
+        )
     
     # Obter condições climáticas finais
     if hasattr(simulation, 'climate'):
         conditions = simulation.climate.get_current_conditions()
-        print("\n" + "=" * 70)
-        print("🌧️ CONDIÇÕES CLIMÁTICAS FINAIS")
-        print("=" * 70)
-        print(f"Temperatura: {conditions['temperature']}°C")
-        print(f"Umidade: {conditions['humidity']}%")
-        print(f"Chuva: {'Sim' if conditions['is_raining'] else 'Não'}")
+        report.append(
+            f"\n{BANNER}\n"
+            "🌧️ CONDIÇÕES CLIMÁTICAS FINAIS\n"
+            f"{BANNER}\n"
+            f"Temperatura: {conditions['temperature']}°C\n"
+            f"Umidade: {conditions['humidity']}%\n"
+            f"Chuva: {'Sim' if conditions['is_raining'] else 'Não'}\n"
+        )
         if conditions['is_raining']:
-            print(f"Intensidade: {conditions['rain_intensity']} mm/h")
-        print(f"Atenuação por clima: {conditions['attenuation']} dB")
+            report.append(f"Intensidade: {conditions['rain_intensity']} mm/h\n")
+        report.append(f"Atenuação por clima: {conditions['attenuation']} dB\n")
+    
+    # Uma única escrita no stdout para todo o relatório
+    sys.stdout.write(''.join(report))
     
-    # Exporta os resultados para CSV
-    simulation.export_to_csv()
+    # Fecha os CSV gravados durante a simulação e grava as estatísticas finais
+    simulation.finish_export_stream()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,8 +1,8 @@
-import simpy
+import os
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-import random
 import math
 
 # Simulation parameters
@@ -21,6 +21,8 @@ PREAMBLE_LENGTH = 8
 N0 = -174           # Thermal noise in dBm/Hz
 NF = 6              # Receiver noise figure in dB
 SNR_THRESHOLD = {7: -7.5, 8: -10, 9: -12.5, 10: -15, 11: -17.5, 12: -20}  # SNR thresholds per SF
+SF_LEVELS = np.arange(7, 13)  # Available spreading factors
+SF_THRESHOLDS = np.array([SNR_THRESHOLD[sf] for sf in SF_LEVELS])  # Same thresholds, indexed by SF-7
 TX_POWER = 14       # Transmission power in dBm
 FREQUENCY = 868     # MHz (EU868)
 
@@ -29,210 +31,245 @@ PL_EXPONENT = 2.8   # Path loss exponent
 REF_DISTANCE = 1000 # Reference distance in meters
 PL_REF = 107.41     # Path loss at reference distance in dB
 
-class LoRaNode:
-    def __init__(self, env, node_id, x, y):
-        self.env = env
-        self.id = node_id
-        self.x = x
-        self.y = y
-        self.data = []  # Store node data
-        self.action = env.process(self.run())
-        
-    def calculate_distance_to_gateway(self):
-        """Calculate Euclidean distance to the gateway"""
-        dx = self.x - GATEWAY_POS[0]
-        dy = self.y - GATEWAY_POS[1]
-        return math.sqrt(dx**2 + dy**2)
-        
-    def calculate_path_loss(self, distance):
-        """Calculate path loss using log-distance model"""
-        if distance <= 0:
-            distance = 1  # Avoid log(0)
-        if distance <= REF_DISTANCE:
-            return PL_REF + 10 * PL_EXPONENT * math.log10(distance/REF_DISTANCE)
-        else:
-            return PL_REF + 10 * PL_EXPONENT * math.log10(distance/REF_DISTANCE)
-    
-    def calculate_rssi(self, path_loss):
-        """Calculate RSSI based on path loss"""
-        return TX_POWER - path_loss
-    
-    def calculate_snr(self, rssi):
-        """Calculate Signal-to-Noise Ratio"""
-        noise_power = N0 + 10 * math.log10(BANDWIDTH) + NF
-        return rssi - noise_power
-    
-    def select_sf(self, snr):
-        """Select appropriate spreading factor based on SNR"""
-        for sf in sorted(SNR_THRESHOLD.keys()):
-            if snr >= SNR_THRESHOLD[sf]:
-                return sf
-        return 12  # Use highest SF if SNR is too low
-    
-    def calculate_airtime(self, sf, payload_size):
-        """Calculate LoRa transmission time in milliseconds"""
-        n_payload = 8 + max(math.ceil((8 * payload_size - 4 * sf + 28 + 16)/(4 * sf)) * CODING_RATE, 0)
-        t_symbol = (2**sf)/BANDWIDTH
-        t_preamble = (PREAMBLE_LENGTH + 4.25) * t_symbol
-        t_payload = n_payload * t_symbol
-        return (t_preamble + t_payload) * 1000  # Convert to ms
-    
-    def calculate_packet_loss_probability(self, snr, sf):
-        """Calculate probability of packet loss based on SNR and SF"""
-        if snr >= SNR_THRESHOLD[sf] + 5:
-            return 0.01  # Very good signal, very low loss
-        elif snr >= SNR_THRESHOLD[sf] + 2:
-            return 0.05  # Good signal
-        elif snr >= SNR_THRESHOLD[sf]:
-            return 0.15  # Acceptable signal
-        elif snr >= SNR_THRESHOLD[sf] - 2:
-            return 0.4   # Poor signal
-        else:
-            return 0.8   # Very poor signal
-    
-    def run(self):
-        """Process to simulate node behavior"""
-        while True:
-            # Wait for next transmission interval
-            yield self.env.timeout(TRANSMISSION_INTERVAL)
-            
-            # Current timestamp
-            timestamp = self.env.now
-            
-            # Generate temperature reading (normal distribution between 20-35°C)
-            temperature = np.random.normal(TEMP_MEAN, TEMP_STD)
-            temperature = max(20, min(35, temperature))  # Constrain between 20-35°C
-            
-            # Calculate network parameters
-            distance = self.calculate_distance_to_gateway()
-            path_loss = self.calculate_path_loss(distance)
-            rssi = self.calculate_rssi(path_loss)
-            snr = self.calculate_snr(rssi)
-            sf = self.select_sf(snr)
-            
-            # Calculate data rate (bits per second)
-            # Using simplified formula: DR = SF * (BW / 2^SF)
-            data_rate = sf * (BANDWIDTH / (2**sf))
-            
-            # Simulate packet transmission
-            payload_size = 10  # 10 bytes for temperature data
-            latency = self.calculate_airtime(sf, payload_size)
-            
-            # Determine if packet is delivered
-            packet_loss_prob = self.calculate_packet_loss_probability(snr, sf)
-            packet_delivered = random.random() > packet_loss_prob
-            
-            # Record data
-            self.data.append({
-                'timestamp': timestamp,
-                'device_id': self.id,
-                'x': self.x,
-                'y': self.y,
-                'temperature': temperature,
-                'rssi': rssi,
-                'snr': snr,
-                'sf': sf,
-                'data_rate': data_rate,
-                'packet_delivered': packet_delivered,
-                'latency_ms': latency
-            })
-
-def run_simulation():
-    # Create simulation environment
-    env = simpy.Environment()
+# Derived constants (evaluated once at import)
+NOISE_POWER_DBM = N0 + 10 * math.log10(BANDWIDTH) + NF  # Receiver noise floor in dBm
+SYMBOL_TIME = (2.0 ** np.arange(7, 13)) / BANDWIDTH    # Symbol time in seconds, indexed by SF-7
+PREAMBLE_TIME = (PREAMBLE_LENGTH + 4.25) * SYMBOL_TIME  # Preamble time in seconds, indexed by SF-7
+
+# Output columns and their storage types
+COLUMN_DTYPES = {
+    'timestamp': np.int32,
+    'device_id': np.int32,
+    'x': np.float32,
+    'y': np.float32,
+    'temperature': np.float32,
+    'rssi': np.float32,
+    'snr': np.float32,
+    'sf': np.int8,
+    'data_rate': np.float32,
+    'packet_delivered': np.bool_,
+    'latency_ms': np.float32
+}
+
+def calculate_distance_to_gateway(x, y):
+    """Calculate Euclidean distance to the gateway"""
+    return np.hypot(x - GATEWAY_POS[0], y - GATEWAY_POS[1])
+
+def calculate_path_loss(distance):
+    """Calculate path loss using log-distance model"""
+    # Same expression on both sides of REF_DISTANCE; clamp at 1 m to avoid log(0)
+    return PL_REF + 10 * PL_EXPONENT * np.log10(np.maximum(distance, 1)/REF_DISTANCE)
+
+def calculate_rssi(path_loss):
+    """Calculate RSSI based on path loss"""
+    return TX_POWER - path_loss
+
+def calculate_snr(rssi):
+    """Calculate Signal-to-Noise Ratio"""
+    return rssi - NOISE_POWER_DBM
+
+def select_sf(snr):
+    """Select appropriate spreading factor based on SNR"""
+    # Thresholds decrease with SF, so their negation is ascending and the lowest SF
+    # whose threshold the SNR meets is found with a single binary search
+    idx = np.searchsorted(-SF_THRESHOLDS, -np.asarray(snr), side='left')
+    return SF_LEVELS[np.minimum(idx, len(SF_LEVELS) - 1)]  # Use highest SF if SNR is too low
+
+def calculate_airtime(sf, payload_size):
+    """Calculate LoRa transmission time in milliseconds"""
+    # Ceiling of the integer ratio computed exactly as -(-a // b)
+    n_symbols = -(-(8 * payload_size - 4 * sf + 28 + 16) // (4 * sf))
+    n_payload = 8 + np.maximum(n_symbols * CODING_RATE, 0)
+    t_payload = n_payload * SYMBOL_TIME[sf - 7]
+    return (PREAMBLE_TIME[sf - 7] + t_payload) * 1000  # Convert to ms
+
+def calculate_packet_loss_probability(snr, sf):
+    """Calculate probability of packet loss based on SNR and SF"""
+    margin = snr - SF_THRESHOLDS[sf - 7]
+    return np.select(
+        [margin >= 5,    # Very good signal, very low loss
+         margin >= 2,    # Good signal
+         margin >= 0,    # Acceptable signal
+         margin >= -2],  # Poor signal
+        [0.01, 0.05, 0.15, 0.4],
+        default=0.8      # Very poor signal
+    )
+
+def link_budget(x, y, payload_size=10):
+    """Calculate RSSI, SNR, SF, data rate, airtime (ms) and loss probability for nodes at (x, y)"""
+    distance = calculate_distance_to_gateway(x, y)
+    path_loss = calculate_path_loss(distance)
+    rssi = calculate_rssi(path_loss)
+    snr = calculate_snr(rssi)
+    sf = select_sf(snr)
+    
+    # Calculate data rate (bits per second)
+    # Using simplified formula: DR = SF * (BW / 2^SF)
+    data_rate = sf / SYMBOL_TIME[sf - 7]
+    
+    # Simulate packet transmission (10 bytes for temperature data by default)
+    latency = calculate_airtime(sf, payload_size)
+    packet_loss_prob = calculate_packet_loss_probability(snr, sf)
+    return rssi, snr, sf, data_rate, latency, packet_loss_prob
+
+def simulate_nodes(node_ids, seed=None):
+    """Simulate every periodic transmission of the given nodes as a single NumPy batch"""
+    rng = np.random.default_rng(seed)
+    n_nodes = len(node_ids)
+    
+    # Transmission instants shared by all nodes (one every TRANSMISSION_INTERVAL).
+    # Every node fires on the same fixed period, so no event queue is needed; like
+    # the former env.run(until=SIM_TIME), the instant SIM_TIME itself is excluded.
+    timestamps = np.arange(TRANSMISSION_INTERVAL, SIM_TIME, TRANSMISSION_INTERVAL)
+    n_ticks = len(timestamps)
     
     # Create nodes with random positions
-    nodes = []
-    for i in range(NUM_NODES):
-        x = random.uniform(0, AREA_SIZE)
-        y = random.uniform(0, AREA_SIZE)
-        nodes.append(LoRaNode(env, i, x, y))
+    x = rng.uniform(0, AREA_SIZE, n_nodes)
+    y = rng.uniform(0, AREA_SIZE, n_nodes)
     
-    # Run simulation
-    env.run(until=SIM_TIME)
+    # Calculate network parameters (node positions are fixed, so one value per node)
+    rssi, snr, sf, data_rate, latency, packet_loss_prob = link_budget(x, y)
     
-    # Collect data from all nodes
-    all_data = []
-    for node in nodes:
-        all_data.extend(node.data)
+    # Preallocate one typed column per field; each node owns a contiguous block of rows
+    columns = {name: np.empty(n_nodes * n_ticks, dtype=dtype) for name, dtype in COLUMN_DTYPES.items()}
+    node_rows = {name: column.reshape(n_nodes, n_ticks) for name, column in columns.items()}
     
-    # Create DataFrame
-    df = pd.DataFrame(all_data)
+    node_rows['timestamp'][:] = timestamps
+    node_rows['device_id'][:] = node_ids[:, None]
+    node_rows['x'][:] = x[:, None]
+    node_rows['y'][:] = y[:, None]
+    node_rows['rssi'][:] = rssi[:, None]
+    node_rows['snr'][:] = snr[:, None]
+    node_rows['sf'][:] = sf[:, None]
+    node_rows['data_rate'][:] = data_rate[:, None]
+    node_rows['latency_ms'][:] = latency[:, None]
+    
+    # Generate temperature readings (normal distribution between 20-35°C)
+    # and packet delivery outcomes for every (node, tick) pair at once
+    temperature = rng.normal(TEMP_MEAN, TEMP_STD, (n_nodes, n_ticks))
+    node_rows['temperature'][:] = np.clip(temperature, 20, 35, out=temperature)  # Clip in place, then one cast
+    uniforms = rng.random((n_nodes, n_ticks), dtype=np.float32)  # float32 is ample for these probabilities
+    np.greater(uniforms, packet_loss_prob[:, None], out=node_rows['packet_delivered'])
+    
+    return columns
+
+def results_frame(columns, num_nodes):
+    """Wrap simulated columns in a DataFrame, one row per transmission grouped by node"""
+    # The node ids are stored as a categorical (pandas keeps the smallest code type)
+    df = pd.DataFrame(columns, copy=False)
+    df['device_id'] = pd.Categorical.from_codes(columns['device_id'], categories=np.arange(num_nodes))
     return df
 
+def run_simulation(seed=None):
+    """Simulate the NUM_NODES deployment and return its results"""
+    return results_frame(simulate_nodes(np.arange(NUM_NODES), seed), NUM_NODES)
+
+def run_sharded(num_nodes, n_shards=None, seed=None):
+    """Simulate a large deployment by splitting its nodes into shards run in parallel"""
+    # Nodes never interact (no gateway contention is modelled), so every shard
+    # advances on its own and the results only need to be stitched together
+    if num_nodes < 0:
+        raise ValueError(f"num_nodes must be non-negative, got {num_nodes}")
+    if num_nodes == 0:
+        return results_frame(simulate_nodes(np.arange(0), seed), 0)
+    n_shards = min(n_shards or os.cpu_count(), num_nodes)
+    shards = np.array_split(np.arange(num_nodes), n_shards)
+    seeds = np.random.SeedSequence(seed).spawn(n_shards)
+    with ProcessPoolExecutor(max_workers=n_shards) as executor:
+        parts = list(executor.map(simulate_nodes, shards, seeds))
+    
+    columns = {name: np.concatenate([part[name] for part in parts]) for name in COLUMN_DTYPES}
+    return results_frame(columns, num_nodes)
+
+def run_many(n_replicas, seed=None):
+    """Run independent simulation replicas in parallel and stack their results"""
+    # Independent child seeds so replicas never share a random stream
+    seeds = np.random.SeedSequence(seed).spawn(n_replicas)
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        results = list(executor.map(run_simulation, seeds))
+    
+    for replica, df in enumerate(results):
+        df.insert(0, 'replica', np.int16(replica))
+    return pd.concat(results, ignore_index=True)
+
+def save_results(df, basename='lorawan_simulation_results'):
+    """Save results as compressed Parquet, or as CSV when no Parquet engine is installed"""
+    try:
+        path = f'{basename}.parquet'
+        df.to_parquet(path, compression='zstd', index=False)
+    except ImportError:
+        path = f'{basename}.csv'
+        df.to_csv(path, index=False, float_format='%.3f')
+    return path
+
 def visualize_results(df):
     """Create visualization plots"""
     # Set up plot style
     plt.style.use('ggplot')
     
+    # Split the data by node once (in node id order) and reuse it in every plot
+    groups = df.groupby('device_id', observed=True)
+    node_frames = dict(list(groups))  # Per-node slices, taken once for both line plots
+    positions = groups[['x', 'y']].first()  # One (x, y) pair per node
+    
+    # All plots share one dashboard figure
+    fig, ax = plt.subplots(2, 2, figsize=(16, 12))
+    
     # Plot 1: Node positions and gateway
-    plt.figure(figsize=(10, 8))
-    plt.scatter(df['x'].unique(), df['y'].unique(), s=100, c='blue', marker='o', label='Nodes')
-    plt.scatter([GATEWAY_POS[0]], [GATEWAY_POS[1]], s=200, c='red', marker='^', label='Gateway')
-    for node_id in df['device_id'].unique():
-        node_data = df[df['device_id'] == node_id].iloc[0]
-        plt.annotate(f"Node {node_id}", (node_data['x'], node_data['y']), 
-                     textcoords="offset points", xytext=(0,10), ha='center')
-    plt.xlim(0, AREA_SIZE)
-    plt.ylim(0, AREA_SIZE)
-    plt.title('LoRaWAN Node Deployment')
-    plt.xlabel('X position (m)')
-    plt.ylabel('Y position (m)')
-    plt.legend()
-    plt.savefig('node_positions.png')
+    ax[0, 0].scatter(positions['x'], positions['y'], s=100, c='blue', marker='o', label='Nodes')
+    ax[0, 0].scatter([GATEWAY_POS[0]], [GATEWAY_POS[1]], s=200, c='red', marker='^', label='Gateway')
+    for node_id, x, y in positions.itertuples():
+        ax[0, 0].annotate(f"Node {node_id}", (x, y), 
+                          textcoords="offset points", xytext=(0,10), ha='center')
+    ax[0, 0].set_xlim(0, AREA_SIZE)
+    ax[0, 0].set_ylim(0, AREA_SIZE)
+    ax[0, 0].set_title('LoRaWAN Node Deployment')
+    ax[0, 0].set_xlabel('X position (m)')
+    ax[0, 0].set_ylabel('Y position (m)')
+    ax[0, 0].legend()
     
     # Plot 2: Temperature readings over time
-    plt.figure(figsize=(12, 6))
-    for node_id in df['device_id'].unique():
-        node_data = df[df['device_id'] == node_id]
-        plt.plot(node_data['timestamp'], node_data['temperature'], label=f'Node {node_id}')
-    plt.title('Temperature Readings Over Time')
-    plt.xlabel('Time (s)')
-    plt.ylabel('Temperature (°C)')
-    plt.legend()
-    plt.savefig('temperature_readings.png')
-    
-    # Plot 3: RSSI values by node
-    plt.figure(figsize=(12, 6))
-    for node_id in df['device_id'].unique():
-        node_data = df[df['device_id'] == node_id]
-        plt.plot(node_data['timestamp'], node_data['rssi'], label=f'Node {node_id}')
-    plt.title('RSSI Values Over Time')
-    plt.xlabel('Time (s)')
-    plt.ylabel('RSSI (dBm)')
-    plt.legend()
-    plt.savefig('rssi_values.png')
+    for node_id, node_data in node_frames.items():
+        ax[0, 1].plot(node_data['timestamp'], node_data['temperature'], label=f'Node {node_id}')
+    ax[0, 1].set_title('Temperature Readings Over Time')
+    ax[0, 1].set_xlabel('Time (s)')
+    ax[0, 1].set_ylabel('Temperature (°C)')
+    ax[0, 1].legend()
+    
+    # Plot 3: RSSI values by node (same time axis as the temperature plot)
+    ax[1, 0].sharex(ax[0, 1])
+    for node_id, node_data in node_frames.items():
+        ax[1, 0].plot(node_data['timestamp'], node_data['rssi'], label=f'Node {node_id}')
+    ax[1, 0].set_title('RSSI Values Over Time')
+    ax[1, 0].set_xlabel('Time (s)')
+    ax[1, 0].set_ylabel('RSSI (dBm)')
+    ax[1, 0].legend()
     
     # Plot 4: Packet delivery ratio by node
-    plt.figure(figsize=(10, 6))
-    node_ids = df['device_id'].unique()
-    delivery_ratios = []
-    
-    for node_id in node_ids:
-        node_data = df[df['device_id'] == node_id]
-        delivery_ratio = node_data['packet_delivered'].mean() * 100
-        delivery_ratios.append(delivery_ratio)
-    
-    plt.bar([str(id) for id in node_ids], delivery_ratios)
-    plt.title('Packet Delivery Ratio by Node')
-    plt.xlabel('Node ID')
-    plt.ylabel('Delivery Ratio (%)')
-    plt.ylim(0, 100)
-    plt.savefig('packet_delivery.png')
+    delivery_ratios = groups['packet_delivered'].mean() * 100
+    ax[1, 1].bar(delivery_ratios.index.astype(str), delivery_ratios.values)
+    ax[1, 1].set_title('Packet Delivery Ratio by Node')
+    ax[1, 1].set_xlabel('Node ID')
+    ax[1, 1].set_ylabel('Delivery Ratio (%)')
+    ax[1, 1].set_ylim(0, 100)
+    
+    fig.tight_layout()
+    fig.savefig('dashboard.png', dpi=100)
+    plt.close(fig)
 
 if __name__ == "__main__":
     # Run simulation
     print("Starting LoRaWAN simulation...")
     results = run_simulation()
     
-    # Save results to CSV
-    results.to_csv('lorawan_simulation_results.csv', index=False)
-    print(f"Simulation complete. {len(results)} data points collected.")
+    # Save results
+    results_path = save_results(results)
+    print(f"Simulation complete. {len(results)} data points collected in {results_path}.")
     
     # Visualize results
     print("Generating visualization plots...")
     visualize_results(results)
-    print("Visualization complete. Check the current directory for CSV and PNG files.")
+    print("Visualization complete. Check the current directory for the results file and dashboard.png.")
     
     # Display summary statistics
     print("\nSummary Statistics:")
@@ -1,18 +1,55 @@
 import simpy
-import random
+import numpy as np
+import pandas as pd
 import math
+import heapq
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+from functools import lru_cache
 import threading
+import logging
+import logging.handlers
+import queue
+import sys
 from datetime import datetime
-import csv
 from enum import Enum
 
+try:
+    from numba import njit
+except ImportError:  # Numba é opcional: sem ele as funções marcadas rodam em Python puro
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# Mensagens de eventos da simulação (silenciosas, a menos que setup_logging seja chamado)
+logger = logging.getLogger(__name__)
+
 # Configurações globais da simulação
 SIM_TIME = 3600  # Tempo total de simulação em segundos
 DISTANCES = [100, 200, 300, 400]  # Distâncias dos dispositivos ao gateway em metros
 DEVICE_NAMES = ["ESP32-1", "ESP32-2", "ESP32-3", "ESP32-4"]
 INITIAL_TEMPS = [27.5, 28.2, 27.8, 28.5]  # Temperaturas iniciais mais adequadas para Amazônia
+RAINY_MONTHS = frozenset({12, 1, 2, 3, 4, 5})  # Dez-Mai: estação chuvosa
+BANNER = "=" * 70  # Separador das seções do relatório
+TX_INTERVAL = 300  # Intervalo entre transmissões em segundos (comum a todos os dispositivos)
+HISTORY_FIELDS = ('temperature', 'humidity', 'rain', 'rssi', 'snr', 'latency', 'energy')
+
+# Colunas do registro de pacotes recebidos pelo gateway e seus tipos
+RX_DTYPES = {
+    'time': np.float64,  # segundos desde a época
+    'device_id': np.int16,
+    'temperature': np.float32,
+    'rssi': np.float32,
+    'snr': np.float32,
+    'latency': np.float32,  # ms
+    'sf': np.int8,
+    'bw': np.int16,
+    'cr': np.int8,
+    'humidity': np.float32,  # NaN quando o pacote não traz dados climáticos
+    'is_raining': bool,
+    'rain_intensity': np.float32,
+}
 
 # Configurações LoRaWAN padrão
 DEFAULT_SF = 7  # Spreading Factor (7-12)
@@ -20,6 +57,18 @@ DEFAULT_BW = 125  # Bandwidth em kHz (125, 250, 500)
 DEFAULT_CR = 5  # Coding Rate (5 para 4/5, 6 para 4/6, etc.)
 DEFAULT_TP = 14  # Potência de transmissão em dBm (2-14)
 
+# Deslocamento do fuso local em segundos, para formatar horários sem criar objetos datetime
+UTC_OFFSET = int(datetime.now().astimezone().utcoffset().total_seconds())
+
+def format_clock(t):
+    """Formata um timestamp (segundos desde a época) como HH:MM:SS no fuso local"""
+    t = int(t + UTC_OFFSET) % 86400
+    return f"{t // 3600:02d}:{t // 60 % 60:02d}:{t % 60:02d}"
+
+def format_timestamps(times):
+    """Formata timestamps (segundos desde a época) como HH:MM:SS"""
+    return [format_clock(t) for t in times]
+
 class SeasonType(Enum):
     """Tipos de estação na Amazônia"""
     RAINY = "estação chuvosa"     # Dezembro a Maio
@@ -27,8 +76,16 @@ class SeasonType(Enum):
 
 class AmazonClimate:
     """Simulação de clima amazônico"""
-    def __init__(self, env, season=SeasonType.RAINY, vegetation_density=0.8):
+    __slots__ = ('env', 'rng', 'season', 'vegetation_density',
+                 'base_temp', 'temp_variation', 'base_humidity', 'humidity_variation',
+                 'rain_probability', 'max_rain_intensity',
+                 'current_temperature', 'current_humidity', 'is_raining', 'rain_intensity',
+                 '_attenuation', '_snr_factor', '_loss_factor', '_energy_factor', '_conditions',
+                 'diurnal_table', 'rain_ends', 'process')
+    
+    def __init__(self, env, season=SeasonType.RAINY, vegetation_density=0.8, rng=None):
         self.env = env
+        self.rng = np.random.default_rng(rng)
         self.season = season
         self.vegetation_density = vegetation_density  # 0-1 (0: área aberta, 1: floresta densa)
         
@@ -53,6 +110,14 @@ class AmazonClimate:
         self.current_humidity = self.base_humidity
         self.is_raining = False
         self.rain_intensity = 0.0  # mm/h
+        self.refresh_conditions()
+        
+        # Fator diurno tabelado por intervalo de 10 minutos do dia (144 intervalos, pico às 14h)
+        hours = np.arange(144) * 10 / 60
+        self.diurnal_table = np.sin((hours - 6) * math.pi / 12).tolist()
+        
+        # Horários (tempo de simulação) previstos para o fim das chuvas em andamento
+        self.rain_ends = []
         
         # Iniciar processo de atualização do clima
         self.process = env.process(self.update_weather())
@@ -60,57 +125,84 @@ class AmazonClimate:
     def update_weather(self):
         """Atualiza condições climáticas a cada 10 minutos"""
         while True:
-            # Simula variação diurna de temperatura (ciclo de 24h)
-            hour_of_day = (time.time() + self.env.now) % 86400 / 3600  # 0-24
-            diurnal_factor = math.sin((hour_of_day - 6) * math.pi / 12)  # Pico às 14h
-            
-            # Temperatura varia com hora do dia + componente aleatório
-            self.current_temperature = (
-                self.base_temp + 
-                diurnal_factor * self.temp_variation + 
-                random.uniform(-0.5, 0.5)
-            )
-            
-            # Umidade é inversa à temperatura + componente aleatório
-            self.current_humidity = (
-                self.base_humidity - 
-                diurnal_factor * self.humidity_variation + 
-                random.uniform(-3.0, 3.0)
-            )
-            self.current_humidity = max(40, min(100, self.current_humidity))
-            
-            # Determina chuva (mais provável com alta umidade)
-            humidity_factor = (self.current_humidity - 60) / 40  # 0-1
-            adjusted_rain_prob = self.rain_probability * humidity_factor
+            self.sample_weather()
+            yield self.env.timeout(600)
+    
+    def end_due_rains(self):
+        """Encerra as chuvas cujo término já chegou (aplicado sob demanda, antes de cada uso do clima)"""
+        # Heap ordenado pelo horário de término; o processo do clima não acorda no meio do intervalo
+        while self.rain_ends and self.rain_ends[0] <= self.env.now:
+            self.end_rain(heapq.heappop(self.rain_ends))
+    
+    def sample_weather(self):
+        """Sorteia as condições climáticas dos próximos 10 minutos"""
+        self.end_due_rains()
+        
+        # Um bloco de números aleatórios por atualização
+        u = self.rng.random(4)
+        now = time.time() + self.env.now
+        
+        # Simula variação diurna de temperatura (ciclo de 24h)
+        diurnal_factor = self.diurnal_table[int(now // 600) % 144]
+        
+        # Temperatura varia com hora do dia + componente aleatório
+        self.current_temperature = (
+            self.base_temp + 
+            diurnal_factor * self.temp_variation + 
+            (u[0] - 0.5)
+        )
+        
+        # Umidade é inversa à temperatura + componente aleatório
+        self.current_humidity = (
+            self.base_humidity - 
+            diurnal_factor * self.humidity_variation + 
+            6.0 * (u[1] - 0.5)
+        )
+        self.current_humidity = max(40, min(100, self.current_humidity))
+        
+        # Determina chuva (mais provável com alta umidade)
+        humidity_factor = (self.current_humidity - 60) / 40  # 0-1
+        adjusted_rain_prob = self.rain_probability * humidity_factor
+        
+        if u[2] < adjusted_rain_prob:
+            self.is_raining = True
+            self.rain_intensity = 2.0 + (self.max_rain_intensity - 2.0) * u[3]
+            duration = int(self.rng.integers(10, 181))  # Duração de 10 a 180 minutos
             
-            if random.random() < adjusted_rain_prob:
-                self.is_raining = True
-                self.rain_intensity = random.uniform(2.0, self.max_rain_intensity)
-                duration = random.randint(10, 180)  # Duração de 10 a 180 minutos
-                
-                # Print informações sobre chuva
-                timestamp = datetime.fromtimestamp(time.time() + self.env.now).strftime('%H:%M:%S')
-                print(f"[{timestamp}] 🌧️ Chuva iniciada: {self.rain_intensity:.1f} mm/h (prevista para {duration} minutos)")
-                
-                # Programa o fim da chuva
-                def end_rain():
-                    self.is_raining = False
-                    self.rain_intensity = 0.0
-                    timestamp = datetime.fromtimestamp(time.time() + self.env.now).strftime('%H:%M:%S')
-                    print(f"[{timestamp}] ☀️ Chuva cessou")
-                
-                self.env.process(self.delayed_action(duration, end_rain))
+            # Print informações sobre chuva
+            timestamp = format_clock(now)
+            logger.info("[%s] 🌧️ Chuva iniciada: %.1f mm/h (prevista para %d minutos)",
+                        timestamp, self.rain_intensity, duration)
             
-            # Aguarda 10 minutos antes da próxima atualização
-            yield self.env.timeout(600)
+            # Programa o fim da chuva
+            heapq.heappush(self.rain_ends, self.env.now + duration * 60)
+        
+        self.refresh_conditions()
     
-    def delayed_action(self, delay_minutes, action_func):
-        """Executa uma ação após um atraso em minutos"""
-        yield self.env.timeout(delay_minutes * 60)
-        action_func()
+    def end_rain(self, end_time=None):
+        """Encerra a chuva atual (`end_time`: horário de término previsto, em tempo de simulação)"""
+        self.is_raining = False
+        self.rain_intensity = 0.0
+        self.refresh_conditions()
+        timestamp = format_clock(time.time() + (self.env.now if end_time is None else end_time))
+        logger.info("[%s] ☀️ Chuva cessou", timestamp)
     
-    def get_attenuation_factor(self):
-        """Retorna um fator de atenuação para comunicação baseado nas condições climáticas"""
+    def refresh_conditions(self):
+        """Recalcula os fatores climáticos e o dicionário de condições após uma mudança no clima"""
+        self._attenuation = self.compute_attenuation_factor()
+        self._snr_factor = self.compute_snr_factor()
+        self._loss_factor = self.compute_loss_factor()
+        self._energy_factor = self.compute_energy_factor()
+        self._conditions = {
+            'temperature': round(self.current_temperature, 1),
+            'humidity': round(self.current_humidity, 1),
+            'is_raining': self.is_raining,
+            'rain_intensity': round(self.rain_intensity, 1) if self.is_raining else 0,
+            'attenuation': round(self._attenuation, 2)
+        }
+    
+    def compute_attenuation_factor(self):
+        """Calcula o fator de atenuação para comunicação baseado nas condições climáticas"""
         # Chuva atenua significativamente sinal RF em frequências mais altas
         rain_attenuation = self.rain_intensity * 0.2 if self.is_raining else 0
         
@@ -122,19 +214,63 @@ class AmazonClimate:
         
         return rain_attenuation + humidity_attenuation + vegetation_attenuation
     
+    def get_attenuation_factor(self):
+        """Retorna o fator de atenuação calculado na última mudança do clima"""
+        return self._attenuation
+    
+    def compute_snr_factor(self):
+        """Calcula a variação do SNR (dB) causada pelas condições climáticas"""
+        climate_factor = 0
+        
+        # Chuva reduz SNR significativamente
+        if self.is_raining:
+            climate_factor -= self.rain_intensity * 0.1
+        
+        # Alta umidade também degrada o SNR
+        if self.current_humidity > 85:
+            climate_factor -= (self.current_humidity - 85) * 0.05
+        
+        return climate_factor
+    
+    def compute_loss_factor(self):
+        """Calcula o fator pelo qual o clima multiplica a probabilidade de perda de pacotes"""
+        weather_factor = 1.0
+        if self.is_raining:
+            weather_factor += (self.rain_intensity / 30) * 0.5
+        if self.current_humidity > 85:
+            weather_factor += (self.current_humidity - 85) / 30
+        return weather_factor
+    
+    def compute_energy_factor(self):
+        """Calcula o fator de aumento do consumo de energia em clima quente"""
+        temperature_factor = 1.0
+        if self.current_temperature > 30:
+            temperature_factor += (self.current_temperature - 30) * 0.03
+        return temperature_factor
+    
+    def get_snr_factor(self):
+        """Retorna a variação do SNR calculada na última mudança do clima"""
+        return self._snr_factor
+    
+    def get_loss_factor(self):
+        """Retorna o fator de perda de pacotes calculado na última mudança do clima"""
+        return self._loss_factor
+    
+    def get_energy_factor(self):
+        """Retorna o fator de consumo de energia calculado na última mudança do clima"""
+        return self._energy_factor
+    
     def get_current_conditions(self):
-        """Retorna um dicionário com as condições climáticas atuais"""
-        return {
-            'temperature': round(self.current_temperature, 1),
-            'humidity': round(self.current_humidity, 1),
-            'is_raining': self.is_raining,
-            'rain_intensity': round(self.rain_intensity, 1) if self.is_raining else 0,
-            'attenuation': round(self.get_attenuation_factor(), 2)
-        }
+        """Retorna o dicionário (somente leitura) com as condições climáticas atuais"""
+        return self._conditions
 
 class TemperatureSensor:
     """Simulação de um sensor de temperatura DS18B20 com influências ambientais"""
-    def __init__(self, initial_temp=28.0, noise=0.5, drift=0.02, climate=None):
+    __slots__ = ('rng', 'temperature', 'noise', 'drift', 'climate',
+                 'last_failure_check', 'is_malfunctioning', 'malfunction_duration')
+    
+    def __init__(self, initial_temp=28.0, noise=0.5, drift=0.02, climate=None, rng=None):
+        self.rng = np.random.default_rng(rng)
         self.temperature = initial_temp
         self.noise = noise  # Ruído nas medições
         self.drift = drift  # Desvio gradual da temperatura ao longo do tempo
@@ -143,9 +279,11 @@ class TemperatureSensor:
         self.is_malfunctioning = False
         self.malfunction_duration = 0
         
-    def read(self):
+    def read(self, now=None):
         """Simula a leitura do sensor, com ruído, desvio e influências climáticas"""
-        now = time.time()
+        if now is None:
+            now = time.time()
+        u = self.rng.random(6)  # Um bloco de números aleatórios por leitura
         
         # Verifica se o sensor falhou devido à alta umidade (mais comum na Amazônia)
         if self.climate and not self.is_malfunctioning:
@@ -153,20 +291,22 @@ class TemperatureSensor:
                 self.last_failure_check = now
                 humidity = self.climate.current_humidity
                 # Probabilidade de falha aumenta com umidade alta
-                failure_prob = ((humidity - 85) / 30) ** 3 if humidity > 85 else 0
-                if random.random() < failure_prob:
+                excess = (humidity - 85) / 30
+                failure_prob = excess * excess * excess if humidity > 85 else 0
+                if u[0] < failure_prob:
                     self.is_malfunctioning = True
-                    self.malfunction_duration = random.randint(5, 30) * 60  # 5-30 minutos
-                    print(f"⚠️ Sensor entrando em falha temporária por {self.malfunction_duration/60:.1f} minutos (umidade: {humidity:.1f}%)")
+                    self.malfunction_duration = (5 + int(u[1] * 26)) * 60  # 5-30 minutos
+                    logger.info("⚠️ Sensor entrando em falha temporária por %.1f minutos (umidade: %.1f%%)",
+                                self.malfunction_duration / 60, humidity)
         
         # Recupera de falha após o tempo determinado
         if self.is_malfunctioning:
             if now - self.last_failure_check > self.malfunction_duration:
                 self.is_malfunctioning = False
-                print("✅ Sensor recuperado da falha temporária")
+                logger.info("✅ Sensor recuperado da falha temporária")
             else:
                 # Durante falha, retorna leituras muito incorretas ou NaN
-                return float('nan') if random.random() < 0.3 else random.uniform(10, 50)
+                return float('nan') if u[2] < 0.3 else 10 + 40 * u[3]
                 
         # Se temos clima, acompanha a temperatura ambiente com algum atraso
         if self.climate:
@@ -175,16 +315,44 @@ class TemperatureSensor:
             self.temperature = self.temperature * 0.9 + ambient_temp * 0.1
         else:
             # Sem clima, apenas adiciona um pequeno desvio na temperatura
-            self.temperature += random.uniform(-self.drift, self.drift)
+            self.temperature += self.drift * (2 * u[4] - 1)
         
         # Adiciona ruído à leitura (maior durante chuva devido a interferência)
         noise_factor = 2.0 if (self.climate and self.climate.is_raining) else 1.0
-        reading = self.temperature + random.uniform(-self.noise, self.noise) * noise_factor
+        reading = self.temperature + self.noise * (2 * u[5] - 1) * noise_factor
         
         # Arredonda para uma casa decimal, como um sensor real
         return round(reading, 1)
 
-@dataclass
+@njit(cache=True)
+def airtime(sf, bw, cr, payload_size=10):
+    """Calcula o tempo no ar (s) de um pacote LoRa, compilado com Numba quando disponível"""
+    n_preamble = 8  # Número de símbolos do preâmbulo
+    
+    # Converte BW para Hz
+    bw_hz = bw * 1000.0
+    
+    # Duração de um símbolo (2^SF / BW, com 2^SF por deslocamento de bits)
+    t_symbol = (1 << sf) / bw_hz
+    
+    # Componentes do tempo de transmissão LoRa
+    t_preamble = (n_preamble + 4.25) * t_symbol
+    
+    # Número de símbolos
+    payload_symb_nb = 8 + max(math.ceil((8 * payload_size - 4 * sf + 28) / (4 * sf)) * cr, 0)
+    
+    # Tempo de payload
+    t_payload = payload_symb_nb * t_symbol
+    
+    # Tempo total no ar em segundos
+    return t_preamble + t_payload
+
+@lru_cache(maxsize=None)
+def cached_airtime(sf, bw, cr):
+    """Tempo no ar memoizado por (sf, bw, cr), já que poucas combinações são usadas"""
+    return airtime(sf, bw, cr)
+
+@dataclass(frozen=True, slots=True)
 class LoRaConfig:
     """Configuração de parâmetros LoRaWAN"""
     sf: int  # Spreading Factor
@@ -195,264 +363,198 @@ class LoRaConfig:
     @property
     def airtime(self):
         """Calcula o tempo no ar de um pacote com payload de 10 bytes"""
-        payload_size = 10  # Tamanho do payload em bytes
-        n_preamble = 8  # Número de símbolos do preâmbulo
-        
-        # Converte BW para Hz
-        bw_hz = self.bw * 1000
-        
-        # Componentes do tempo de transmissão LoRa
-        t_preamble = (n_preamble + 4.25) * (2**self.sf / bw_hz)
-        
-        # Número de símbolos
-        payload_symb_nb = 8 + max(math.ceil((8 * payload_size - 4 * self.sf + 28) / (4 * self.sf)) * (self.cr), 0)
-        
-        # Tempo de payload
-        t_payload = payload_symb_nb * (2**self.sf / bw_hz)
-        
-        # Tempo total no ar em segundos
-        airtime = t_preamble + t_payload
-        
-        return airtime
+        return cached_airtime(self.sf, self.bw, self.cr)
+
+# Compila (ou carrega do cache) a versão nativa na importação, fora da simulação
+airtime(DEFAULT_SF, DEFAULT_BW, DEFAULT_CR)
+
+def calculate_rssi_base(distances, sf):
+    """Calcula a parte do RSSI que depende só da distância e do SF (constante entre reconfigurações)"""
+    # Parâmetros do modelo de propagação
+    path_loss_exponent = 2.7  # Expoente de perda de caminho (2.0-4.0)
+    reference_distance = 1.0  # Distância de referência em metros
+    
+    # RSSI a 1m (calculado com a equação de Friis)
+    rssi_at_ref = -30  # dBm
+    
+    # Calcular RSSI na distância atual
+    # (constantes agrupadas para uma única multiplicação sobre o array)
+    rssi = rssi_at_ref - (10 * path_loss_exponent) * np.log10(distances / reference_distance)
+    
+    # Adicionar efeito do SF (SFs mais altos têm melhor sensibilidade)
+    return rssi + (sf - 7) * 2.5
+
+def calculate_rssi(rssi_base, shadowing, attenuation=0.0):
+    """Calcula o RSSI de cada dispositivo somando à base o sombreamento gaussiano e a atenuação climática"""
+    return np.round(rssi_base + shadowing - attenuation, 1)
+
+def calculate_snr_base(distances, sf):
+    """Calcula a parte do SNR que depende só da distância e do SF (constante entre reconfigurações)"""
+    # Base SNR está relacionada com a distância
+    base_snr = 10 - (distances / 100)
+    
+    # SFs mais altos têm melhor desempenho com SNR baixo
+    return base_snr + (sf - 7) * 0.5
+
+def calculate_snr(snr_base, variation, climate_factor=0.0):
+    """Calcula o SNR de cada dispositivo com base em condições simuladas e clima"""
+    return np.round(snr_base + variation + climate_factor, 1)
+
+def calculate_energy_consumption(tp, tx_time, temperature_factor=1.0, power_issue_factor=1.0):
+    """Calcula o consumo de energia (mWh) de cada dispositivo em um ciclo de transmissão"""
+    # Consumo em diferentes estados (valores aproximados para ESP32 + módulo LoRa)
+    power_tx = 120.0 + (tp * 5)  # mW durante transmissão (ajustado pela potência)
+    power_sleep = 0.1  # mW em sleep mode
+    
+    # Energia usada durante a transmissão (problemas elétricos tornam o consumo inconsistente)
+    tx_energy = (power_tx * tx_time * temperature_factor) / 3600 * power_issue_factor
+    
+    # Energia usada durante o sleep
+    sleep_time = TX_INTERVAL - tx_time
+    sleep_energy = (power_sleep * sleep_time * temperature_factor) / 3600
+    
+    return tx_energy + sleep_energy
+
+def calculate_packet_loss_probability(distances, sf, battery, weather_factor=1.0):
+    """Calcula a probabilidade de perda de pacote de cada dispositivo"""
+    # Probabilidade base (baseada na distância e SF) aumentada pelos fatores climáticos
+    # (limites aplicados no próprio array, sem cópias intermediárias)
+    packet_loss_prob = distances / (5000 * sf)
+    np.clip(packet_loss_prob, 0, 0.9, out=packet_loss_prob)
+    packet_loss_prob *= weather_factor
+    np.clip(packet_loss_prob, 0, 0.95, out=packet_loss_prob)
+    
+    # Quando a bateria está baixa, maior probabilidade de perda de pacote
+    low_battery = battery < 15
+    packet_loss_prob[low_battery] = np.clip(packet_loss_prob[low_battery] * 1.5, 0, 0.98)
+    return packet_loss_prob
+
+@njit(cache=True)
+def run_steps(rng, n_steps, distances, sf, tp, rssi_base, snr_base, tx_time,
+              attenuation, snr_factor, loss_factor, energy_factor, drain_factor, high_humidity,
+              battery, energy_used, packets_sent, packets_received, last_rssi, last_snr,
+              latency_sum, jitter_sum, prev_latency, power_issues,
+              out_rssi, out_snr, out_latency, out_energy):
+    """Laço compilado de run_fast: avança n_steps transmissões de todos os dispositivos com clima fixo
+    
+    `rng` é um np.random.Generator próprio da chamada (o gerador global do NumPy não é tocado).
+    """
+    for t in range(n_steps):
+        for d in range(len(distances)):
+            # RSSI e SNR
+            rssi = round(rssi_base[d] + rng.normal(0.0, 3.0) - attenuation, 1)
+            snr = round(snr_base[d] + rng.uniform(-2.0, 2.0) + snr_factor, 1)
+            
+            # Consumo de energia (problemas de alimentação só em alta umidade)
+            power_issue_factor = 1.0
+            power_issues[d] = high_humidity and rng.random() < 0.05
+            if power_issues[d]:
+                power_issue_factor = rng.uniform(1.5, 2.5)
+            tx_energy = (120.0 + tp[d] * 5) * tx_time[d] * energy_factor / 3600 * power_issue_factor
+            sleep_energy = 0.1 * (TX_INTERVAL - tx_time[d]) * energy_factor / 3600
+            energy = tx_energy + sleep_energy
+            energy_used[d] += energy
+            battery[d] = max(battery[d] - 0.01 * energy * 30 * drain_factor, 0.0)
+            
+            # Probabilidade de perda de pacote
+            packet_loss_prob = min(min(0.9, distances[d] / (5000 * sf[d])) * loss_factor, 0.95)
+            if battery[d] < 15:
+                packet_loss_prob = min(0.98, packet_loss_prob * 1.5)
+            
+            # Transmissão
+            latency = tx_time[d] + rng.uniform(0.0, 0.5)
+            packets_sent[d] += 1
+            if rng.random() > packet_loss_prob:
+                packets_received[d] += 1
+                last_rssi[d] = rssi
+                last_snr[d] = snr
+                latency_sum[d] += latency
+                if packets_received[d] > 1:
+                    jitter_sum[d] += abs(latency - prev_latency[d])
+                prev_latency[d] = latency
+            
+            out_rssi[t, d] = rssi
+            out_snr[t, d] = snr
+            out_latency[t, d] = latency * 1000
+            out_energy[t, d] = energy_used[d]
 
 class LoRaDevice:
     """Dispositivo LoRaWAN (ESP32 com sensor de temperatura)"""
-    def __init__(self, env, id, name, gateway, distance, initial_temp, climate):
-        self.env = env
+    __slots__ = ('network', 'index', 'env', 'id', 'name', 'gateway', 'climate',
+                 'sensor', 'config', 'tx_interval')
+    
+    def __init__(self, network, index, id, name, initial_temp):
+        # Distância, parâmetros de rádio e bateria ficam nos arrays da simulação
+        # (posição `index`), que processa todos os dispositivos em lote
+        self.network = network
+        self.index = index
+        self.env = network.env
         self.id = id
         self.name = name
-        self.gateway = gateway
-        self.distance = distance  # Distância ao gateway em metros
-        self.climate = climate
-        self.sensor = TemperatureSensor(initial_temp, climate=climate)
+        self.gateway = network.gateway
+        self.climate = network.climate
+        self.sensor = TemperatureSensor(initial_temp, climate=self.climate, rng=network.rng)
         
         # Configuração LoRa
         self.config = LoRaConfig(sf=DEFAULT_SF, bw=DEFAULT_BW, cr=DEFAULT_CR, tp=DEFAULT_TP)
         
         # Configuração de transmissão
-        self.tx_interval = 300  # Intervalo entre transmissões em segundos
-        
-        # Métricas
-        self.packets_sent = 0
-        self.packets_received = 0
-        self.energy_used = 0  # em mWh
-        self.last_rssi = 0
-        self.last_snr = 0
-        self.latencies = []
-        
-        # Histórico de dados
-        self.history = {
-            'timestamp': [],
-            'temperature': [],
-            'humidity': [],
-            'rain': [],
-            'rssi': [],
-            'snr': [],
-            'latency': [],
-            'energy': []
-        }
-        
-        # Controles de hardware
-        self.battery_level = 100  # percentual de bateria
-        self.battery_drain_rate = 0.01  # % por transmissão base
-        self.has_power_issues = False
+        self.tx_interval = TX_INTERVAL  # Intervalo entre transmissões em segundos
         
-        # Inicia o processo de envio periódico
-        self.process = env.process(self.run())
-        
-    def calculate_rssi(self):
-        """Calcula o RSSI com base na distância e condições ambientais"""
-        # Parâmetros do modelo de propagação
-        freq = 868  # Frequência em MHz
-        path_loss_exponent = 2.7  # Expoente de perda de caminho (2.0-4.0)
-        reference_distance = 1.0  # Distância de referência em metros
-        shadowing = random.gauss(0, 3)  # Sombreamento gaussiano em dB
-        
-        # RSSI a 1m (calculado com a equação de Friis)
-        rssi_at_ref = -30  # dBm
-        
-        # Calcular RSSI na distância atual
-        rssi = rssi_at_ref - 10 * path_loss_exponent * math.log10(self.distance / reference_distance) + shadowing
-        
-        # Adicionar efeito do SF (SFs mais altos têm melhor sensibilidade)
-        rssi_sf_bonus = (self.config.sf - 7) * 2.5
-        
-        # Atenuação devido às condições climáticas
-        if self.climate:
-            weather_attenuation = self.climate.get_attenuation_factor()
-            rssi -= weather_attenuation
-        
-        return round(rssi + rssi_sf_bonus, 1)
+        # As métricas (contadores e somas de latência/jitter) ficam nos arrays da simulação
     
-    def calculate_snr(self):
-        """Calcula o SNR com base em condições simuladas e clima"""
-        # Base SNR está relacionada com a distância
-        base_snr = 10 - (self.distance / 100)
-        
-        # Adicionar variação aleatória
-        variation = random.uniform(-2, 2)
-        
-        # SFs mais altos têm melhor desempenho com SNR baixo
-        sf_bonus = (self.config.sf - 7) * 0.5
-        
-        # Fatores climáticos afetam o SNR
-        climate_factor = 0
-        if self.climate:
-            # Chuva reduz SNR significativamente
-            if self.climate.is_raining:
-                climate_factor -= self.climate.rain_intensity * 0.1
-            
-            # Alta umidade também degrada o SNR
-            if self.climate.current_humidity > 85:
-                climate_factor -= (self.climate.current_humidity - 85) * 0.05
-        
-        return round(base_snr + variation + sf_bonus + climate_factor, 1)
+    @property
+    def history(self):
+        """Histórico de dados do dispositivo (visões somente leitura da coluna `index` dos arrays da simulação)"""
+        # Linhas abaixo de history_len já estão completas e não mudam mais, então
+        # podem ser lidas de outra thread sem lock enquanto a simulação avança
+        n = self.network.history_len
+        history = {'timestamp': self.network.history_time[:n]}
+        for field in HISTORY_FIELDS:
+            history[field] = self.network.history[field][:n, self.index]
+        for values in history.values():
+            values.flags.writeable = False
+        return history
     
-    def calculate_energy_consumption(self, tx_time):
-        """Calcula o consumo de energia durante uma transmissão"""
-        # Consumo em diferentes estados (valores aproximados para ESP32 + módulo LoRa)
-        power_tx = 120.0 + (self.config.tp * 5)  # mW durante transmissão (ajustado pela potência)
-        power_sleep = 0.1  # mW em sleep mode
-        
-        # Em clima quente e úmido, o consumo de energia aumenta
-        temperature_factor = 1.0
-        if self.climate and self.climate.current_temperature > 30:
-            temperature_factor += (self.climate.current_temperature - 30) * 0.03
-        
-        # Energia usada durante a transmissão
-        tx_energy = (power_tx * tx_time * temperature_factor) / 3600  # mWh
-        
-        # Energia usada durante o sleep
-        sleep_time = self.tx_interval - tx_time
-        sleep_energy = (power_sleep * sleep_time * temperature_factor) / 3600  # mWh
-        
-        # Simula problemas de energia (mais comuns em alta umidade)
-        if self.climate and self.climate.current_humidity > 90 and random.random() < 0.05:
-            if not self.has_power_issues:
-                self.has_power_issues = True
-                print(f"⚡ {self.name}: Problemas detectados na alimentação (alta umidade)")
-            tx_energy *= random.uniform(1.5, 2.5)  # Consumo inconsistente por problemas elétricos
-        else:
-            self.has_power_issues = False
-        
-        return tx_energy + sleep_energy
+    @property
+    def distance(self):
+        """Distância ao gateway em metros"""
+        return self.network.distances[self.index]
     
-    def update_battery(self, energy_used):
-        """Atualiza o nível de bateria e simula degradação"""
-        # Converte energia usada em percentual da bateria
-        drain_percentage = self.battery_drain_rate * (energy_used * 30)  # Fator de escala 
-        
-        # Temperatura alta acelera descarga da bateria 
-        if self.climate and self.climate.current_temperature > 32:
-            drain_percentage *= 1 + (self.climate.current_temperature - 32) * 0.1
-        
-        self.battery_level -= drain_percentage
-        self.battery_level = max(0, self.battery_level)
-        
-        # Quando bateria baixa, mostrar aviso
-        if self.battery_level < 20 and self.battery_level % 5 < 0.5:
-            print(f"🔋 {self.name}: Bateria baixa ({self.battery_level:.1f}%)")
+    @property
+    def battery_level(self):
+        """Nível de bateria em percentual"""
+        return self.network.battery[self.index]
     
-    def run(self):
-        """Processo principal do dispositivo"""
-        while True:
-            # Aguarda o intervalo de transmissão
-            yield self.env.timeout(self.tx_interval)
-            
-            # Simula variações no intervalo de transmissão devido a problemas de clock
-            # (comum em alta umidade e temperatura da Amazônia)
-            if self.climate and self.climate.current_humidity > 90 and random.random() < 0.1:
-                drift = random.uniform(-30, 30)
-                timestamp = datetime.fromtimestamp(time.time() + self.env.now).strftime('%H:%M:%S')
-                print(f"[{timestamp}] ⏱️ {self.name}: Desvio de clock detectado: {drift:.1f}s (alta umidade)")
-            
-            # Lê o sensor
-            temperature = self.sensor.read()
-            
-            # Obtém dados climáticos (se disponíveis)
-            climate_data = self.climate.get_current_conditions() if self.climate else {
-                'humidity': None, 'is_raining': False, 'rain_intensity': 0
-            }
-            
-            # Calcula RSSI e SNR
-            rssi = self.calculate_rssi()
-            snr = self.calculate_snr()
-            
-            # Calcula tempo de transmissão
-            tx_time = self.config.airtime
-            
-            # Calcula consumo de energia
-            energy = self.calculate_energy_consumption(tx_time)
-            self.energy_used += energy
-            self.update_battery(energy)
-            
-            # Probabilidade de perda de pacote (baseada na distância, SF e condições climáticas)
-            base_loss_prob = min(0.9, self.distance / 5000 * (1 / self.config.sf))
-            
-            # Fatores climáticos aumentam perda de pacotes
-            weather_factor = 1.0
-            if self.climate:
-                if self.climate.is_raining:
-                    weather_factor += (self.climate.rain_intensity / 30) * 0.5
-                if self.climate.current_humidity > 85:
-                    weather_factor += (self.climate.current_humidity - 85) / 30
-            
-            packet_loss_prob = min(0.95, base_loss_prob * weather_factor)
-            
-            # Quando a bateria está baixa, maior probabilidade de perda de pacote
-            if self.battery_level < 15:
-                packet_loss_prob = min(0.98, packet_loss_prob * 1.5)
-            
-            # Incrementa contador de pacotes enviados
-            self.packets_sent += 1
-            
-            # Simula transmissão
-            tx_start = self.env.now
-            latency = tx_time + random.uniform(0, 0.5)  # Adiciona jitter
-            
-            # Se o valor é NaN (sensor falhou), registre como None no histórico
-            temp_value = None if math.isnan(temperature) else temperature
-            
-            # Registra os valores atuais
-            timestamp = datetime.fromtimestamp(time.time() + self.env.now).strftime('%H:%M:%S')
-            self.history['timestamp'].append(timestamp)
-            self.history['temperature'].append(temp_value)
-            self.history['humidity'].append(climate_data['humidity'])
-            self.history['rain'].append(climate_data['rain_intensity'] if climate_data['is_raining'] else 0)
-            self.history['rssi'].append(rssi)
-            self.history['snr'].append(snr)
-            self.history['latency'].append(latency * 1000)  # Converte para ms
-            self.history['energy'].append(self.energy_used)
-            
-            # Se o sensor falhou, não envia o pacote
-            if math.isnan(temperature):
-                print(f"[{timestamp}] {self.name}: ❌ Falha no sensor - pacote não enviado")
-                continue
-            
-            # Determina se o pacote foi recebido
-            if random.random() > packet_loss_prob:
-                # Pacote recebido com sucesso
-                self.packets_received += 1
-                self.last_rssi = rssi
-                self.last_snr = snr
-                self.latencies.append(latency)
-                
-                # Notifica o gateway
-                yield self.env.timeout(latency)
-                self.gateway.receive_packet(self, temperature, rssi, snr, latency, climate_data)
-            else:
-                # Pacote perdido, determina causa provável
-                loss_reason = "desconhecida"
-                if self.climate and self.climate.is_raining and self.climate.rain_intensity > 20:
-                    loss_reason = "chuva forte"
-                elif self.climate and self.climate.current_humidity > 90:
-                    loss_reason = "alta umidade"
-                elif self.distance > 300 and self.config.sf < 10:
-                    loss_reason = "distância/SF inadequado"
-                elif self.battery_level < 15:
-                    loss_reason = "bateria fraca"
-                
-                print(f"[{timestamp}] {self.name}: ❌ Pacote perdido! Causa provável: {loss_reason}")
+    @property
+    def has_power_issues(self):
+        """Indica problemas de alimentação detectados na última transmissão"""
+        return self.network.has_power_issues[self.index]
+    
+    @property
+    def packets_sent(self):
+        """Número de pacotes enviados"""
+        return int(self.network.packets_sent[self.index])
+    
+    @property
+    def packets_received(self):
+        """Número de pacotes recebidos pelo gateway"""
+        return int(self.network.packets_received[self.index])
+    
+    @property
+    def energy_used(self):
+        """Energia consumida em mWh"""
+        return self.network.energy_used[self.index]
+    
+    @property
+    def last_rssi(self):
+        """RSSI (dBm) do último pacote recebido"""
+        return self.network.last_rssi[self.index]
+    
+    @property
+    def last_snr(self):
+        """SNR (dB) do último pacote recebido"""
+        return self.network.last_snr[self.index]
     
     @property
     def packet_delivery_ratio(self):
@@ -468,55 +570,65 @@ class LoRaDevice:
     
     @property
     def average_latency(self):
-        """Calcula a latência média em ms"""
-        if not self.latencies:
+        """Calcula a latência média em ms a partir da soma acumulada"""
+        n_latencies = self.packets_received
+        if n_latencies == 0:
             return 0
-        return sum(self.latencies) * 1000 / len(self.latencies)  # Converte para ms
+        return self.network.latency_sum[self.index] * 1000 / n_latencies  # Converte para ms
     
     @property
     def jitter(self):
-        """Calcula o jitter (variação na latência) em ms"""
-        if len(self.latencies) < 2:
+        """Calcula o jitter (variação na latência) em ms a partir da soma acumulada das diferenças"""
+        n_latencies = self.packets_received
+        if n_latencies < 2:
             return 0
-        latency_diffs = [abs(self.latencies[i] - self.latencies[i-1]) for i in range(1, len(self.latencies))]
-        return sum(latency_diffs) * 1000 / len(latency_diffs)  # Converte para ms
+        return self.network.jitter_sum[self.index] * 1000 / (n_latencies - 1)  # Converte para ms
 
 class LoRaGateway:
     """Gateway LoRaWAN central"""
-    def __init__(self, env, climate=None):
+    def __init__(self, env, climate=None, rng=None):
         self.env = env
+        self.rng = np.random.default_rng(rng)
         self.climate = climate
         self.devices = []
-        self.received_data = []
         self.uptime = 100  # Percentual de tempo ativo
         
         # Iniciar processo de simulação de disponibilidade
         if climate:
             self.process = env.process(self.simulate_availability())
+        
+        # Pacotes recebidos em colunas pré-alocadas (uma posição por pacote)
+        n_max = len(DEVICE_NAMES) * (SIM_TIME // TX_INTERVAL + 2)
+        self.rx_len = 0
+        self.rx = {field: np.empty(n_max, dtype=dtype) for field, dtype in RX_DTYPES.items()}
     
     def simulate_availability(self):
         """Simula problemas de disponibilidade do gateway"""
         while True:
+            self.climate.end_due_rains()
+            
             # Condições extremas podem causar quedas no gateway
-            if self.climate.is_raining and self.climate.rain_intensity > 25 and random.random() < 0.2:
+            if self.climate.is_raining and self.climate.rain_intensity > 25 and self.rng.random() < 0.2:
                 # Queda temporária devido a tempestade
-                downtime = random.uniform(5, 20)
+                downtime = self.rng.uniform(5, 20)
                 self.uptime = 0
-                timestamp = datetime.fromtimestamp(time.time() + self.env.now).strftime('%H:%M:%S')
-                print(f"[{timestamp}] 🌩️ GATEWAY: Queda temporária devido a tempestade (duração prevista: {downtime:.1f} min)")
+                timestamp = format_clock(time.time() + self.env.now)
+                logger.info("[%s] 🌩️ GATEWAY: Queda temporária devido a tempestade (duração prevista: %.1f min)",
+                            timestamp, downtime)
                 
                 # Recuperação após o tempo de queda
                 yield self.env.timeout(downtime * 60)
                 self.uptime = 100
-                timestamp = datetime.fromtimestamp(time.time() + self.env.now).strftime('%H:%M:%S')
-                print(f"[{timestamp}] ✅ GATEWAY: Conexão reestabelecida após {downtime:.1f} minutos")
+                timestamp = format_clock(time.time() + self.env.now)
+                logger.info("[%s] ✅ GATEWAY: Conexão reestabelecida após %.1f minutos", timestamp, downtime)
             
             # Verifica degradação por alta umidade
-            elif self.climate.current_humidity > 90 and random.random() < 0.1:
+            elif self.climate.current_humidity > 90 and self.rng.random() < 0.1:
                 # Degradação temporária
-                self.uptime = random.uniform(70, 90)
-                timestamp = datetime.fromtimestamp(time.time() + self.env.now).strftime('%H:%M:%S')
-                print(f"[{timestamp}] ⚠️ GATEWAY: Degradação de desempenho devido alta umidade (uptime: {self.uptime:.1f}%)")
+                self.uptime = self.rng.uniform(70, 90)
+                timestamp = format_clock(time.time() + self.env.now)
+                logger.info("[%s] ⚠️ GATEWAY: Degradação de desempenho devido alta umidade (uptime: %.1f%%)",
+                            timestamp, self.uptime)
                 
                 # Recuperação gradual
                 yield self.env.timeout(30 * 60)  # 30 minutos
@@ -529,49 +641,70 @@ class LoRaGateway:
         """Adiciona um dispositivo à lista de dispositivos conectados"""
         self.devices.append(device)
         
-    def receive_packet(self, device, temperature, rssi, snr, latency, climate_data=None):
-        """Recebe um pacote de um dispositivo"""
+    def receive_packet(self, device, temperature, rssi, snr, latency, climate_data=None, now=None):
+        """Recebe um pacote de um dispositivo (now: horário do passo, em segundos desde a época)"""
+        if now is None:
+            now = time.time() + self.env.now
+        
         # Verifica se o gateway está disponível
         if hasattr(self, 'uptime') and self.uptime < 100:
-            if random.random() > (self.uptime / 100):
+            if self.rng.random() > (self.uptime / 100):
                 # Gateway indisponível, pacote perdido
-                timestamp = datetime.fromtimestamp(time.time() + self.env.now).strftime('%H:%M:%S')
-                print(f"[{timestamp}] {device.name}: ⚠️ Pacote recebido pelo gateway mas não processado (gateway instável)")
+                timestamp = format_clock(now)
+                logger.info("[%s] %s: ⚠️ Pacote recebido pelo gateway mas não processado (gateway instável)",
+                            timestamp, device.name)
                 return
         
-        timestamp = datetime.fromtimestamp(time.time() + self.env.now).strftime('%H:%M:%S')
-        
-        # Registra os dados recebidos
-        packet_data = {
-            'timestamp': timestamp,
-            'device_id': device.id,
-            'device_name': device.name,
-            'temperature': temperature,
-            'rssi': rssi,
-            'snr': snr,
-            'latency': latency * 1000,  # ms
-            'sf': device.config.sf,
-            'bw': device.config.bw,
-            'cr': device.config.cr,
-        }
+        timestamp = format_clock(now)
+        
+        # Registra os dados recebidos na próxima posição das colunas
+        i = self.rx_len
+        if i == len(self.rx['time']):
+            self.grow_rx()
+        rx = self.rx
+        rx['time'][i] = now
+        rx['device_id'][i] = device.id
+        rx['temperature'][i] = temperature
+        rx['rssi'][i] = rssi
+        rx['snr'][i] = snr
+        rx['latency'][i] = latency * 1000  # ms
+        rx['sf'][i] = device.config.sf
+        rx['bw'][i] = device.config.bw
+        rx['cr'][i] = device.config.cr
         
         # Adiciona dados climáticos se disponíveis
         if climate_data:
-            packet_data['humidity'] = climate_data['humidity']
-            packet_data['is_raining'] = climate_data['is_raining']
-            packet_data['rain_intensity'] = climate_data['rain_intensity']
+            rx['humidity'][i] = climate_data['humidity']
+            rx['is_raining'][i] = climate_data['is_raining']
+            rx['rain_intensity'][i] = climate_data['rain_intensity']
+        else:
+            rx['humidity'][i] = np.nan
+            rx['is_raining'][i] = False
+            rx['rain_intensity'][i] = np.nan
         
-        self.received_data.append(packet_data)
+        self.rx_len += 1
         
-        # Formata mensagem de recebimento com dados climáticos quando disponíveis
+        # Formata mensagem de recebimento (com dados climáticos quando disponíveis) só se for exibida
+        if not logger.isEnabledFor(logging.INFO):
+            return
         climate_info = ""
         if climate_data and climate_data['humidity'] is not None:
             climate_info = f", Umidade={climate_data['humidity']:.1f}%"
             if climate_data['is_raining']:
                 climate_info += f", Chuva={climate_data['rain_intensity']:.1f}mm/h"
         
-        print(f"[{timestamp}] ✅ Pacote recebido de {device.name}: Temp={temperature}°C, RSSI={rssi}dBm, SNR={snr}dB, Latência={latency*1000:.1f}ms{climate_info}")
+        logger.info("[%s] ✅ Pacote recebido de %s: Temp=%s°C, RSSI=%sdBm, SNR=%sdB, Latência=%.1fms%s",
+                    timestamp, device.name, temperature, rssi, snr, latency * 1000, climate_info)
         
+    def grow_rx(self):
+        """Dobra a capacidade do registro de pacotes recebidos"""
+        for field, values in self.rx.items():
+            self.rx[field] = np.resize(values, 2 * len(values))
+    
+    def get_received_data(self):
+        """Retorna as colunas dos pacotes recebidos até agora"""
+        return {field: values[:self.rx_len] for field, values in self.rx.items()}
+    
     def get_stats(self):
         """Retorna estatísticas da rede"""
         stats = {}
@@ -593,38 +726,279 @@ class LoRaGateway:
 
 class LoRaNetworkSimulation:
     """Simulação completa da rede LoRaWAN"""
-    def __init__(self, season=SeasonType.RAINY, vegetation_density=0.8):
+    def __init__(self, season=SeasonType.RAINY, vegetation_density=0.8, seed=None):
         self.env = simpy.Environment()
         
+        # Gerador aleatório único, compartilhado por clima, gateway e dispositivos
+        self.rng = np.random.default_rng(seed)
+        
         # Cria o sistema climático
-        self.climate = AmazonClimate(self.env, season, vegetation_density)
+        self.climate = AmazonClimate(self.env, season, vegetation_density, self.rng)
         
         # Cria o gateway com referência ao clima
-        self.gateway = LoRaGateway(self.env, self.climate)
+        self.gateway = LoRaGateway(self.env, self.climate, self.rng)
         self.devices = []
         
+        # Estado dos dispositivos em arrays (um elemento por dispositivo)
+        n_devices = len(DEVICE_NAMES)
+        self.distances = np.array(DISTANCES, dtype=float)  # Distância ao gateway em metros
+        self.sf = np.full(n_devices, DEFAULT_SF)
+        self.tp = np.full(n_devices, DEFAULT_TP)
+        self.battery = np.full(n_devices, 100.0)  # percentual de bateria
+        self.battery_drain_rate = 0.01  # % por transmissão base
+        self.has_power_issues = np.zeros(n_devices, dtype=bool)
+        
+        # Métricas por dispositivo
+        self.packets_sent = np.zeros(n_devices, dtype=int)
+        self.packets_received = np.zeros(n_devices, dtype=int)
+        self.energy_used = np.zeros(n_devices)  # em mWh
+        self.last_rssi = np.zeros(n_devices)
+        self.last_snr = np.zeros(n_devices)
+        
+        # Somas acumuladas para latência média e jitter (em segundos)
+        self.latency_sum = np.zeros(n_devices)
+        self.jitter_sum = np.zeros(n_devices)
+        self.prev_latency = np.zeros(n_devices)
+        
+        # Histórico pré-alocado: uma linha por transmissão, uma coluna por dispositivo
+        # (timestamps em segundos desde a época, formatados apenas na exportação)
+        n_max = SIM_TIME // TX_INTERVAL + 2
+        self.history_len = 0
+        self.history_time = np.empty(n_max)
+        self.history = {field: np.empty((n_max, n_devices), dtype=np.float32)
+                        for field in HISTORY_FIELDS}
+        
         # Cria os dispositivos
-        for i in range(4):
+        for i in range(n_devices):
             device = LoRaDevice(
-                self.env, 
+                self,
+                index=i,
                 id=i+1,
                 name=DEVICE_NAMES[i],
-                gateway=self.gateway,
-                distance=DISTANCES[i],
-                initial_temp=INITIAL_TEMPS[i],
-                climate=self.climate
+                initial_temp=INITIAL_TEMPS[i]
             )
             self.devices.append(device)
             self.gateway.add_device(device)
+        self.refresh_link_constants()
+        
+        # Um único processo transmite por todos os dispositivos
+        self.process = self.env.process(self.run_devices())
+            
+        # Fim da última execução de run_fast: o processo dos dispositivos pula os passos
+        # anteriores a este instante, que já foram calculados pelo laço compilado
+        self.fast_until = 0.0
             
         # Para visualização em tempo real
         self.running = False
-        self.data_lock = threading.Lock()
+    
+    def refresh_link_constants(self):
+        """Recalcula os termos de RSSI, SNR e tempo no ar que só mudam com a configuração"""
+        self.rssi_base = calculate_rssi_base(self.distances, self.sf)
+        self.snr_base = calculate_snr_base(self.distances, self.sf)
+        self.tx_time = np.array([device.config.airtime for device in self.devices])
+    
+    def run_devices(self):
+        """Processo principal: todos os dispositivos transmitem juntos a cada TX_INTERVAL"""
+        while True:
+            # Aguarda o intervalo de transmissão
+            yield self.env.timeout(TX_INTERVAL)
+            if self.env.now >= self.fast_until:
+                self.step_devices()
+    
+    def step_devices(self):
+        """Executa uma transmissão de cada dispositivo, com a física calculada em lote"""
+        n_devices = len(self.devices)
+        climate = self.climate
+        climate.end_due_rains()
+        
+        # Um único horário por passo, repassado a sensores e gateway
+        wall_now = time.time()
+        now = wall_now + self.env.now
+        timestamp = format_clock(now)
+        
+        # Todos os números aleatórios do passo em um só bloco (uma linha por uso)
+        u = self.rng.random((7, n_devices))
+        shadowing = 3 * self.rng.standard_normal(n_devices)
+        
+        # Simula variações no intervalo de transmissão devido a problemas de clock
+        # (comum em alta umidade e temperatura da Amazônia)
+        if climate.current_humidity > 90:
+            for i in np.flatnonzero(u[0] < 0.1):
+                device = self.devices[i]
+                drift = 60 * u[1, i] - 30
+                logger.info("[%s] ⏱️ %s: Desvio de clock detectado: %.1fs (alta umidade)",
+                            timestamp, device.name, drift)
+        
+        # Lê os sensores e obtém dados climáticos
+        temperatures = [device.sensor.read(wall_now) for device in self.devices]
+        climate_data = climate.get_current_conditions()
+        
+        # Calcula RSSI e SNR
+        rssi = calculate_rssi(self.rssi_base, shadowing, climate.get_attenuation_factor())
+        snr = calculate_snr(self.snr_base, 4 * u[2] - 2, climate.get_snr_factor())
+        
+        # Tempo de transmissão (pré-calculado por configuração)
+        tx_time = self.tx_time
+        
+        # Simula problemas de energia (mais comuns em alta umidade)
+        if climate.current_humidity > 90:
+            power_issues = u[3] < 0.05
+        else:
+            power_issues = np.zeros(n_devices, dtype=bool)
+        for i in np.flatnonzero(power_issues & ~self.has_power_issues):
+            logger.info("⚡ %s: Problemas detectados na alimentação (alta umidade)", self.devices[i].name)
+        self.has_power_issues = power_issues
+        power_issue_factor = np.where(power_issues, 1.5 + u[4], 1.0)
+        
+        # Calcula consumo de energia (em clima quente e úmido, o consumo aumenta)
+        energy = calculate_energy_consumption(self.tp, tx_time, climate.get_energy_factor(),
+                                              power_issue_factor)
+        self.update_battery(energy)
+        
+        # Probabilidade de perda de pacote (baseada na distância, SF, clima e bateria)
+        packet_loss_prob = calculate_packet_loss_probability(self.distances, self.sf, self.battery,
+                                                             climate.get_loss_factor())
+        
+        # Simula transmissão
+        latency = tx_time + 0.5 * u[5]  # Adiciona jitter
+        delivered = u[6] > packet_loss_prob
+        
+        # Atualiza as métricas (se o sensor falhou, o pacote não é enviado)
+        failed = np.isnan(temperatures)
+        received = delivered & ~failed
+        self.energy_used += energy
+        self.packets_sent += 1
+        self.packets_received += received
+        self.last_rssi[received] = rssi[received]
+        self.last_snr[received] = snr[received]
+        
+        # Latência e jitter incrementais (diferença para a latência do pacote anterior)
+        self.latency_sum[received] += latency[received]
+        has_prev = received & (self.packets_received > 1)
+        self.jitter_sum[has_prev] += np.abs(latency[has_prev] - self.prev_latency[has_prev])
+        self.prev_latency[received] = latency[received]
+        
+        # Registra os valores atuais no histórico (temperatura NaN indica falha do sensor)
+        row = self.history_len
+        if row == len(self.history_time):
+            self.grow_history()
+        history = self.history
+        self.history_time[row] = now
+        history['temperature'][row] = temperatures
+        history['humidity'][row] = climate_data['humidity']
+        history['rain'][row] = climate_data['rain_intensity'] if climate_data['is_raining'] else 0
+        history['rssi'][row] = rssi
+        history['snr'][row] = snr
+        history['latency'][row] = latency * 1000  # Converte para ms
+        history['energy'][row] = self.energy_used
+        self.history_len += 1  # Publica a linha para os leitores só depois de completa
+        
+        # Mensagens e entrega ao gateway, dispositivo a dispositivo
+        for device, temperature, rssi_i, snr_i, latency_i, failed_i, delivered_i in zip(
+                self.devices, temperatures, rssi.tolist(), snr.tolist(),
+                latency.tolist(), failed.tolist(), delivered.tolist()):
+            if failed_i:
+                logger.info("[%s] %s: ❌ Falha no sensor - pacote não enviado", timestamp, device.name)
+                continue
+            
+            # Determina se o pacote foi recebido
+            if delivered_i:
+                # Pacote recebido com sucesso: notifica o gateway
+                self.gateway.receive_packet(device, temperature, rssi_i, snr_i, latency_i,
+                                            climate_data, now)
+            else:
+                # Pacote perdido, determina causa provável
+                loss_reason = "desconhecida"
+                if climate.is_raining and climate.rain_intensity > 20:
+                    loss_reason = "chuva forte"
+                elif climate.current_humidity > 90:
+                    loss_reason = "alta umidade"
+                elif device.distance > 300 and device.config.sf < 10:
+                    loss_reason = "distância/SF inadequado"
+                elif device.battery_level < 15:
+                    loss_reason = "bateria fraca"
+                
+                logger.info("[%s] %s: ❌ Pacote perdido! Causa provável: %s", timestamp, device.name, loss_reason)
+    
+    def grow_history(self):
+        """Dobra a capacidade do histórico quando a simulação passa de SIM_TIME"""
+        n_max = 2 * len(self.history_time)
+        self.history_time = np.resize(self.history_time, n_max)
+        self.history = {field: np.resize(values, (n_max, values.shape[1]))
+                        for field, values in self.history.items()}
+    
+    def update_battery(self, energy_used):
+        """Atualiza o nível de bateria dos dispositivos e simula degradação"""
+        # Converte energia usada em percentual da bateria
+        drain_percentage = self.battery_drain_rate * (energy_used * 30)  # Fator de escala 
+        
+        # Temperatura alta acelera descarga da bateria 
+        if self.climate.current_temperature > 32:
+            drain_percentage *= 1 + (self.climate.current_temperature - 32) * 0.1
+        
+        self.battery -= drain_percentage
+        np.maximum(self.battery, 0, out=self.battery)
+        
+        # Quando bateria baixa, mostrar aviso
+        for i in np.flatnonzero((self.battery < 20) & (self.battery % 5 < 0.5)):
+            logger.info("🔋 %s: Bateria baixa (%.1f%%)", self.devices[i].name, self.battery[i])
+    
+    def run_fast(self, duration=SIM_TIME):
+        """Executa as transmissões sem mensagens, com o laço compilado (para varreduras de parâmetros)
+        
+        Args:
+            duration: Tempo a simular em segundos, a partir do ponto atual (como em run_simulation)
+        """
+        # O clima fica fixo nas condições atuais, os sensores não falham e o gateway
+        # não registra pacotes individuais; contadores e histórico são atualizados
+        # Mesmas transmissões que run_simulation(duration) faria: múltiplos de TX_INTERVAL
+        # no relógio do SimPy, de agora (inclusive) até o fim (exclusive)
+        end = self.env.now + duration
+        first = max(TX_INTERVAL, math.ceil(self.env.now / TX_INTERVAL) * TX_INTERVAL)
+        n_steps = max(0, math.ceil((end - first) / TX_INTERVAL))
+        while self.history_len + n_steps > len(self.history_time):
+            self.grow_history()
+        rows = slice(self.history_len, self.history_len + n_steps)
+        
+        climate = self.climate
+        climate.end_due_rains()
+        drain_factor = 1.0
+        if climate.current_temperature > 32:
+            drain_factor += (climate.current_temperature - 32) * 0.1
+        history = self.history
+        power_issues = self.has_power_issues.copy()  # Atualizado a cada passo (fica o do último)
+        run_steps(np.random.default_rng(self.rng.integers(2**63)), n_steps, self.distances, self.sf, self.tp,
+                  self.rssi_base, self.snr_base, self.tx_time,
+                  climate.get_attenuation_factor(), climate.get_snr_factor(), climate.get_loss_factor(),
+                  climate.get_energy_factor(), drain_factor, climate.current_humidity > 90,
+                  self.battery, self.energy_used, self.packets_sent, self.packets_received,
+                  self.last_rssi, self.last_snr, self.latency_sum, self.jitter_sum, self.prev_latency,
+                  power_issues, history['rssi'][rows], history['snr'][rows], history['latency'][rows],
+                  history['energy'][rows])
+        self.has_power_issues = power_issues
+        
+        # Colunas de clima e horário do histórico, constantes durante a execução
+        conditions = climate.get_current_conditions()
+        self.history_time[rows] = time.time() + first + TX_INTERVAL * np.arange(n_steps)
+        history['temperature'][rows] = conditions['temperature']
+        history['humidity'][rows] = conditions['humidity']
+        history['rain'][rows] = conditions['rain_intensity']
+        self.history_len += n_steps
+        
+        # Avança o relógio do SimPy até o fim (clima e gateway seguem seu curso), sem
+        # repetir as transmissões já calculadas; assim os dois caminhos podem se alternar
+        self.fast_until = end
+        if end > self.env.now:
+            self.env.run(until=end)
     
     def run_simulation(self, duration=SIM_TIME):
-        """Executa a simulação por um período determinado"""
+        """Executa a simulação por um período determinado
+        
+        Args:
+            duration: Tempo a simular em segundos, a partir do ponto atual (não o instante final)
+        """
         self.running = True
-        self.env.run(until=duration)
+        self.env.run(until=self.env.now + duration)
         self.running = False
     
     def run_in_thread(self, duration=SIM_TIME):
@@ -636,126 +1010,90 @@ class LoRaNetworkSimulation:
     
     def get_network_stats(self):
         """Retorna estatísticas da rede"""
-        with self.data_lock:
-            return self.gateway.get_stats()
+        return self.gateway.get_stats()
     
     def get_all_temperature_data(self):
-        """Retorna todos os dados de temperatura dos dispositivos"""
+        """Retorna todos os dados de temperatura dos dispositivos (visões somente leitura, sem cópia)"""
         data = {}
-        with self.data_lock:
-            for device in self.devices:
-                data[device.name] = {
-                    'timestamp': device.history['timestamp'].copy(),
-                    'temperature': device.history['temperature'].copy(),
-                    'humidity': device.history['humidity'].copy(),
-                    'rain': device.history['rain'].copy()
-                }
+        for device in self.devices:
+            history = device.history
+            data[device.name] = {
+                'timestamp': history['timestamp'],
+                'temperature': history['temperature'],
+                'humidity': history['humidity'],
+                'rain': history['rain']
+            }
         return data
     
     def get_all_metric_data(self):
-        """Retorna todos os dados de métricas dos dispositivos"""
+        """Retorna todos os dados de métricas dos dispositivos (visões somente leitura, sem cópia)"""
         data = {}
-        with self.data_lock:
-            for device in self.devices:
-                data[device.name] = {
-                    'timestamp': device.history['timestamp'].copy(),
-                    'rssi': device.history['rssi'].copy(),
-                    'snr': device.history['snr'].copy(),
-                    'latency': device.history['latency'].copy(),
-                    'energy': device.history['energy'].copy()
-                }
+        for device in self.devices:
+            history = device.history
+            data[device.name] = {
+                'timestamp': history['timestamp'],
+                'rssi': history['rssi'],
+                'snr': history['snr'],
+                'latency': history['latency'],
+                'energy': history['energy']
+            }
         return data
 
     def change_device_config(self, device_id, sf=None, bw=None, cr=None, tp=None):
         """Altera a configuração de um dispositivo"""
         device = self.devices[device_id-1]
-        if sf is not None:
-            device.config.sf = sf
-        if bw is not None:
-            device.config.bw = bw
-        if cr is not None:
-            device.config.cr = cr
-        if tp is not None:
-            device.config.tp = tp
-        print(f"Configuração de {device.name} alterada: SF={device.config.sf}, BW={device.config.bw}, CR=4/{device.config.cr}, TP={device.config.tp}dBm")
+        
+        # LoRaConfig é imutável: cria uma nova configuração com os valores alterados
+        changes = {name: value for name, value in (('sf', sf), ('bw', bw), ('cr', cr), ('tp', tp))
+                   if value is not None}
+        device.config = replace(device.config, **changes)
+        self.sf[device.index] = device.config.sf
+        self.tp[device.index] = device.config.tp
+        self.refresh_link_constants()
+        logger.info("Configuração de %s alterada: SF=%d, BW=%d, CR=4/%d, TP=%ddBm", device.name,
+                    device.config.sf, device.config.bw, device.config.cr, device.config.tp)
     
     def export_to_csv(self):
         """Exporta os resultados da simulação para arquivos CSV"""
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         
         # 1. Exportar estatísticas de rede
-        stats = self.get_network_stats()
-        with open(f'network_stats_{timestamp}.csv', 'w', newline='') as csvfile:
-            fieldnames = ['device', 'packets_sent', 'packets_received', 'pdr', 'plr', 
-                         'avg_latency', 'jitter', 'rssi', 'snr', 'energy', 'airtime', 'battery']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            
-            writer.writeheader()
-            for device_name, device_stats in stats.items():
-                row = {
-                    'device': device_name,
-                    'packets_sent': device_stats['packets_sent'],
-                    'packets_received': device_stats['packets_received'],
-                    'pdr': device_stats['pdr'],
-                    'plr': device_stats['plr'],
-                    'avg_latency': device_stats['avg_latency'],
-                    'jitter': device_stats['jitter'],
-                    'rssi': device_stats['rssi'],
-                    'snr': device_stats['snr'],
-                    'energy': device_stats['energy'],
-                    'airtime': device_stats['airtime'],
-                    'battery': device_stats['battery']
-                }
-                writer.writerow(row)
-        
-        # 2. Exportar dados de temperatura e clima
-        temp_data = self.get_all_temperature_data()
-        with open(f'environmental_data_{timestamp}.csv', 'w', newline='') as csvfile:
-            fieldnames = ['timestamp', 'device', 'temperature', 'humidity', 'rain_intensity']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            
-            writer.writeheader()
-            for device_name, data in temp_data.items():
-                for i in range(len(data['timestamp'])):
-                    writer.writerow({
-                        'timestamp': data['timestamp'][i],
-                        'device': device_name,
-                        'temperature': data['temperature'][i],
-                        'humidity': data['humidity'][i],
-                        'rain_intensity': data['rain'][i]
-                    })
+        stats = pd.DataFrame.from_dict(self.get_network_stats(), orient='index')
+        stats.rename_axis('device').reset_index().to_csv(f'network_stats_{timestamp}.csv', index=False)
+        
+        # Séries temporais em formato longo: todas as linhas de um dispositivo, depois do próximo
+        n = self.history_len
+        history = {field: values[:n].T.ravel() for field, values in self.history.items()}
+        series = pd.DataFrame({
+            'timestamp': np.tile(format_timestamps(self.history_time[:n]), len(self.devices)),
+            'device': np.repeat([device.name for device in self.devices], n),
+        })
+        
+        # 2. Exportar dados de temperatura e clima (falhas do sensor ficam vazias)
+        series.assign(
+            temperature=history['temperature'],
+            humidity=history['humidity'],
+            rain_intensity=history['rain']
+        ).to_csv(f'environmental_data_{timestamp}.csv', index=False)
         
         # 3. Exportar dados de métricas
-        metric_data = self.get_all_metric_data()
-        with open(f'metrics_data_{timestamp}.csv', 'w', newline='') as csvfile:
-            fieldnames = ['timestamp', 'device', 'rssi', 'snr', 'latency', 'energy']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            
-            writer.writeheader()
-            for device_name, data in metric_data.items():
-                for i in range(len(data['timestamp'])):
-                    writer.writerow({
-                        'timestamp': data['timestamp'][i],
-                        'device': device_name,
-                        'rssi': data['rssi'][i],
-                        'snr': data['snr'][i],
-                        'latency': data['latency'][i],
-                        'energy': data['energy'][i]
-                    })
+        series.assign(
+            rssi=history['rssi'],
+            snr=history['snr'],
+            latency=history['latency'],
+            energy=history['energy']
+        ).to_csv(f'metrics_data_{timestamp}.csv', index=False)
         
         # 4. Exportar dados de pacotes recebidos
-        with open(f'received_packets_{timestamp}.csv', 'w', newline='') as csvfile:
-            # Determina os fieldnames com base no primeiro pacote recebido (que pode ter dados climáticos)
-            fieldnames = ['timestamp', 'device_id', 'device_name', 'temperature', 
-                         'rssi', 'snr', 'latency', 'sf', 'bw', 'cr']
-            
-            if self.gateway.received_data and 'humidity' in self.gateway.received_data[0]:
-                fieldnames.extend(['humidity', 'is_raining', 'rain_intensity'])
-            
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            for packet in self.gateway.received_data:
-                writer.writerow(packet)
+        packets = pd.DataFrame(self.gateway.get_received_data())
+        device_names = {device.id: device.name for device in self.devices}
+        packets.insert(0, 'timestamp', format_timestamps(packets.pop('time')))
+        packets.insert(2, 'device_name', packets['device_id'].map(device_names))
+        
+        # Inclui dados climáticos apenas se o primeiro pacote recebido os tiver
+        if packets.empty or np.isnan(packets['humidity'].iat[0]):
+            packets = packets.drop(columns=['humidity', 'is_raining', 'rain_intensity'])
+        packets.to_csv(f'received_packets_{timestamp}.csv', index=False)
         
         print(f"\nResultados exportados para arquivos CSV com prefixo timestamp {timestamp}")
         print(f"- network_stats_{timestamp}.csv: Estatísticas gerais da rede")
@@ -763,62 +1101,104 @@ class LoRaNetworkSimulation:
         print(f"- metrics_data_{timestamp}.csv: Métricas de comunicação")
         print(f"- received_packets_{timestamp}.csv: Detalhes dos pacotes recebidos")
 
+class SimulationLogListener(logging.handlers.QueueListener):
+    """Listener da fila de mensagens da simulação; ao parar, desliga a fila do logger do módulo"""
+    def __init__(self, queue_handler, previous_level, *handlers):
+        super().__init__(queue_handler.queue, *handlers)
+        self.queue_handler = queue_handler
+        self.previous_level = previous_level  # Nível do logger antes de setup_logging
+    
+    def stop(self):
+        if self._thread is None:  # Já parado (ou nunca iniciado)
+            return
+        logger.removeHandler(self.queue_handler)
+        logger.setLevel(self.previous_level)
+        super().stop()
+
+def setup_logging(level=logging.INFO):
+    """Envia as mensagens da simulação para o stdout por uma fila, escrita em uma thread separada
+    
+    Retorna o listener da fila; chame `stop()` nele ao final para gravar as mensagens
+    pendentes, remover o handler e restaurar o nível do logger (chamadas repetidas não
+    duplicam as mensagens).
+    """
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+    listener = SimulationLogListener(queue_handler, logger.level, handler)
+    
+    # Só o logger do módulo passa pela fila; o logger raiz da aplicação não é alterado
+    logger.addHandler(queue_handler)
+    logger.setLevel(level)
+    listener.start()
+    return listener
+
 def main():
     """Função principal para executar a simulação"""
     # Determina a estação baseada na data atual
     now = datetime.now()
-    month = now.month
-    is_rainy_season = month in [12, 1, 2, 3, 4, 5]  # Dez-Mai: estação chuvosa
-    season = SeasonType.RAINY if is_rainy_season else SeasonType.DRY
+    today = now.strftime('%d/%m/%Y')
+    season = SeasonType.RAINY if now.month in RAINY_MONTHS else SeasonType.DRY
     
-    print("=" * 70)
+    print(BANNER)
     print(f"🌴 SIMULAÇÃO DE REDE LORAWAN NO AMBIENTE AMAZÔNICO")
-    print("=" * 70)
-    print(f"📅 Data atual: {now.strftime('%d/%m/%Y')}")
+    print(BANNER)
+    print(f"📅 Data atual: {today}")
     print(f"🌧️ Estação: {season.value}")
     print(f"⏱️ Tempo de simulação: {SIM_TIME} segundos")
     print(f"📡 Dispositivos: {', '.join(DEVICE_NAMES)}")
     print(f"📏 Distâncias: {DISTANCES} metros")
     print(f"⚙️ Configuração padrão: SF={DEFAULT_SF}, BW={DEFAULT_BW}kHz, CR=4/{DEFAULT_CR}, TP={DEFAULT_TP}dBm")
-    print("=" * 70 + "\n")
+    print(BANNER + "\n")
     
     # Cria a simulação com clima amazônico
     simulation = LoRaNetworkSimulation(season=season, vegetation_density=0.8)
     
-    # Executa a simulação completa
+    # Executa a simulação completa, exibindo os eventos; a fila é esvaziada antes do resumo
+    log_listener = setup_logging()
     simulation.run_simulation(SIM_TIME)
+    log_listener.stop()
     
     # Exibe estatísticas finais
     stats = simulation.get_network_stats()
-    print("\n" + "=" * 70)
+    print("\n" + BANNER)
     print("📊 ESTATÍSTICAS FINAIS DA REDE LORAWAN")
-    print("=" * 70)
+    print(BANNER)
+    report = []
     for name, device_stats in stats.items():
-        print(f"\n--- {name} ---")
-        print(f"Pacotes enviados: {device_stats['packets_sent']}")
-        print(f"Pacotes recebidos: {device_stats['packets_received']}")
-        print(f"Taxa de entrega (PDR): {device_stats['pdr']:.1f}%")
-        print(f"Taxa de perda (PLR): {device_stats['plr']:.1f}%")
-        print(f"Latência média: {device_stats['avg_latency']:.2f}ms")
-        print(f"Jitter: {device_stats['jitter']:.2f}ms")
-        print(f"RSSI: {device_stats['rssi']}dBm")
-        print(f"SNR: {device_stats['snr']}dB")
-        print(f"Consumo de energia: {device_stats['energy']:.2f}mWh")
-        print(f"Tempo no ar: {device_stats['airtime']:.2f}ms")
-        print(f"Nível de bateria: {device_stats['battery']:.1f}%")
+        report.append(
+            f"\n--- {name} ---\n"
+            f"Pacotes enviados: {device_stats['packets_sent']}\n"
+            f"Pacotes recebidos: {device_stats['packets_received']}\n"
+            f"Taxa de entrega (PDR): {device_stats['pdr']:.1f}%\n"
+            f"Taxa de perda (PLR): {device_stats['plr']:.1f}%\n"
+            f"Latência média: {device_stats['avg_latency']:.2f}ms\n"
+            f"Jitter: {device_stats['jitter']:.2f}ms\n"
+            f"RSSI: {device_stats['rssi']}dBm\n"
+            f"SNR: {device_stats['snr']}dB\n"
+            f"Consumo de energia: {device_stats['energy']:.2f}mWh\n"
+            f"Tempo no ar: {device_stats['airtime']:.2f}ms\n"
+            f"Nível de bateria: {device_stats['battery']:.1f}%\n"
+        )
     
     # Obter condições climáticas finais
     if hasattr(simulation, 'climate'):
+        simulation.climate.end_due_rains()
         conditions = simulation.climate.get_current_conditions()
-        print("\n" + "=" * 70)
-        print("🌧️ CONDIÇÕES CLIMÁTICAS FINAIS")
-        print("=" * 70)
-        print(f"Temperatura: {conditions['temperature']}°C")
-        print(f"Umidade: {conditions['humidity']}%")
-        print(f"Chuva: {'Sim' if conditions['is_raining'] else 'Não'}")
+        report.append(
+            f"\n{BANNER}\n"
+            "🌧️ CONDIÇÕES CLIMÁTICAS FINAIS\n"
+            f"{BANNER}\n"
+            f"Temperatura: {conditions['temperature']}°C\n"
+            f"Umidade: {conditions['humidity']}%\n"
+            f"Chuva: {'Sim' if conditions['is_raining'] else 'Não'}\n"
+        )
         if conditions['is_raining']:
-            print(f"Intensidade: {conditions['rain_intensity']} mm/h")
-        print(f"Atenuação por clima: {conditions['attenuation']} dB")
+            report.append(f"Intensidade: {conditions['rain_intensity']} mm/h\n")
+        report.append(f"Atenuação por clima: {conditions['attenuation']} dB\n")
+    
+    # Uma única escrita no stdout para todo o relatório
+    sys.stdout.write(''.join(report))
     
     # Exporta os resultados para CSV
     simulation.export_to_csv()